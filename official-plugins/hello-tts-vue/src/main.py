@@ -1,29 +1,133 @@
-import argparse
+import asyncio
+import functools
+import hashlib
 import json
+import logging
+import math
+import mimetypes
 import os
+import posixpath
+import re
+import stat
 import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any, Optional
 
-from fastapi import APIRouter, FastAPI, HTTPException
-from fastapi.responses import FileResponse, HTMLResponse
-from fastapi.staticfiles import StaticFiles
+import orjson
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
+from starlette.responses import MalformedRangeHeader
 
-from dawnchat_sdk import create_tool_proxy_router, host
+from dawnchat_sdk import create_tool_proxy_router, host, uvicorn_loop_options
 from dawnchat_sdk.result_utils import extract_result_data
 from dawnchat_sdk.tool_gateway import ToolGateway
 from mcp import build_mcp_router
 
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_manifest_cached(path_str: str, mtime_ns: int) -> dict[str, Any]:
+    try:
+        return orjson.loads(Path(path_str).read_bytes())
+    except Exception:
+        return {}
+
 
 def load_manifest(base_dir: Path) -> dict[str, Any]:
     manifest_path = base_dir / "manifest.json"
-    if not manifest_path.exists():
-        return {}
     try:
-        return json.loads(manifest_path.read_text(encoding="utf-8"))
-    except Exception:
+        mtime_ns = manifest_path.stat().st_mtime_ns
+    except OSError:
         return {}
+    return _load_manifest_cached(str(manifest_path), mtime_ns)
+
+
+class _ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+_ASSET_URL_RE = re.compile(rb"""(=["'])/assets/""")
+_INLINE_ASSET_MAX_BYTES = 1024 * 1024
+
+# url path -> (inline content or None for large files, etag, media type, file path)
+WebAsset = tuple[Optional[bytes], str, str, Path]
+
+
+def _load_web_assets(web_dir: Path) -> dict[str, WebAsset]:
+    assets: dict[str, WebAsset] = {}
+    if not web_dir.is_dir():
+        return assets
+    for root, _, files in os.walk(web_dir):
+        for name in files:
+            file_path = Path(root) / name
+            url_path = file_path.relative_to(web_dir).as_posix()
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if file_path.stat().st_size > _INLINE_ASSET_MAX_BYTES:
+                assets[url_path] = (None, "", media_type, file_path)
+                continue
+            content = file_path.read_bytes()
+            etag = f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+            assets[url_path] = (content, etag, media_type, file_path)
+    return assets
+
+
+_DEFAULT_TASK_STATUS_CACHE_MS = 50.0
+
+
+def _task_status_cache_ttl() -> float:
+    """Read DAWNCHAT_TASK_STATUS_CACHE_MS in seconds; bad values fall back to the default."""
+    raw = os.environ.get("DAWNCHAT_TASK_STATUS_CACHE_MS", "").strip()
+    if not raw:
+        return _DEFAULT_TASK_STATUS_CACHE_MS / 1000.0
+    try:
+        millis = float(raw)
+        if not math.isfinite(millis):
+            raise ValueError(raw)
+    except ValueError:
+        logger.warning(
+            "Invalid DAWNCHAT_TASK_STATUS_CACHE_MS=%r, using %s ms", raw, _DEFAULT_TASK_STATUS_CACHE_MS
+        )
+        millis = _DEFAULT_TASK_STATUS_CACHE_MS
+    return max(millis, 0.0) / 1000.0
+
+
+_TASK_STATUS_CACHE_TTL = _task_status_cache_ttl()
+_default_gateway: Optional[ToolGateway] = None
+_AUDIO_CACHE_CONTROL = "public, max-age=3600"
+
+
+async def _stat_audio(path: str) -> Optional[tuple[os.stat_result, str]]:
+    """Stat a synthesized audio file and derive its ETag from mtime and size."""
+    try:
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(stat_result.st_mode):
+        return None
+    return stat_result, f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+class _AudioFileResponse(FileResponse):
+    @classmethod
+    def _parse_range_header(cls, http_range: str, file_size: int) -> list[tuple[int, int]]:
+        # Starlette answers an invalid range (e.g. ``bytes=5-3``) with 400; RFC 9110 lets
+        # the server ignore it instead, which is what audio players expect.
+        # _parse_range_header is private Starlette API (0.39+, pinned in pyproject.toml).
+        try:
+            return super()._parse_range_header(http_range, file_size)
+        except MalformedRangeHeader:
+            return []
+
+
+def _get_default_gateway() -> ToolGateway:
+    """Gateway over the global ``host`` client, shared by every app built without an explicit client."""
+    global _default_gateway
+    if _default_gateway is None:
+        _default_gateway = ToolGateway(host, status_cache_ttl=_TASK_STATUS_CACHE_TTL)
+    return _default_gateway
 
 
 def _normalize_result(raw: Any) -> Any:
@@ -33,14 +137,29 @@ def _normalize_result(raw: Any) -> Any:
 
 
 def _extract_output_path(task: dict[str, Any]) -> Optional[str]:
+    # Fast path for the usual {"result": {"content": {"data": {"output_path": ...}}}} shape.
+    try:
+        path = task["result"]["content"]["data"]["output_path"]
+    except (KeyError, TypeError):
+        pass
+    else:
+        if isinstance(path, str):
+            path = path.strip()
+            if path:
+                return path
+
     result = _normalize_result(task.get("result"))
 
     # MCP routers may wrap tool result as list[{type: text, text: json-string}]
     if isinstance(result, list) and result:
         first = result[0]
         if isinstance(first, dict) and isinstance(first.get("text"), str):
+            text = first["text"]
+            # Payloads without the key cannot yield a path, so skip decoding them.
+            if '"output_path"' not in text:
+                return None
             try:
-                result = json.loads(first["text"])
+                result = orjson.loads(text)
             except Exception:
                 result = None
 
@@ -61,7 +180,7 @@ def create_app(base_dir: Path, host_client=None) -> FastAPI:
         print(json.dumps({"status": "ready"}), file=sys.stderr, flush=True)
         yield
 
-    app = FastAPI(lifespan=lifespan)
+    app = FastAPI(lifespan=lifespan, default_response_class=_ORJSONResponse)
     web_dir = base_dir / "web"
     manifest = load_manifest(base_dir)
     manifest_tools = manifest.get("capabilities", {}).get("tools", [])
@@ -69,25 +188,26 @@ def create_app(base_dir: Path, host_client=None) -> FastAPI:
     host_port = os.environ.get("DAWNCHAT_HOST_PORT", "")
     base_path = os.environ.get("DAWNCHAT_PLUGIN_BASE_PATH", "").strip().rstrip("/")
 
-    sdk_host = host_client or host
-    gateway = ToolGateway(sdk_host)
+    if host_client is not None:
+        gateway = ToolGateway(host_client, status_cache_ttl=_TASK_STATUS_CACHE_TTL)
+    else:
+        gateway = _get_default_gateway()
 
     api_router = APIRouter(prefix="/api")
 
+    health_body = orjson.dumps({"status": "ok"})
+    info_body = orjson.dumps({"status": "ok", "plugin_id": plugin_id, "host_port": host_port})
+
     @api_router.get("/health")
-    async def health() -> dict[str, str]:
-        return {"status": "ok"}
+    async def health() -> Response:
+        return Response(health_body, media_type="application/json")
 
     @api_router.get("/info")
-    async def info() -> dict[str, str]:
-        return {
-            "status": "ok",
-            "plugin_id": plugin_id,
-            "host_port": host_port,
-        }
+    async def info() -> Response:
+        return Response(info_body, media_type="application/json")
 
     @api_router.get("/tts/audio/{task_id}")
-    async def tts_audio(task_id: str) -> FileResponse:
+    async def tts_audio(task_id: str, request: Request) -> Response:
         payload = await gateway.get_task_status(task_id)
         task = payload.get("task") if isinstance(payload, dict) else None
         if not isinstance(task, dict):
@@ -96,39 +216,78 @@ def create_app(base_dir: Path, host_client=None) -> FastAPI:
         if not output_path:
             raise HTTPException(status_code=404, detail="audio not found")
 
-        audio_path = Path(output_path)
-        if not audio_path.exists() or not audio_path.is_file():
+        cached = await _stat_audio(output_path)
+        if cached is None:
             raise HTTPException(status_code=404, detail="audio not found")
-
-        return FileResponse(path=str(audio_path), media_type="audio/wav", filename=audio_path.name)
+        stat_result, etag = cached
+        cache_headers = {"ETag": etag, "Cache-Control": _AUDIO_CACHE_CONTROL}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=cache_headers)
+
+        # FileResponse answers Range/If-Range itself (206, 416 and multi-range).
+        return _AudioFileResponse(
+            path=output_path,
+            media_type="audio/wav",
+            filename=Path(output_path).name,
+            stat_result=stat_result,
+            headers=cache_headers,
+        )
 
     mcp_router = build_mcp_router(manifest_tools, {})
 
-    def _render_index_html() -> str:
+    def _render_index_html() -> bytes:
         html_path = web_dir / "index.html"
-        html = html_path.read_text(encoding="utf-8")
+        html = html_path.read_bytes()
         if base_path:
-            asset_prefix = f"{base_path}/assets/"
-            html = html.replace('="/assets/', f'="{asset_prefix}')
-            html = html.replace("='/assets/", f"='{asset_prefix}")
+            asset_prefix = f"{base_path}/assets/".encode("utf-8")
+            html = _ASSET_URL_RE.sub(lambda match: match.group(1) + asset_prefix, html)
         return html
 
+    index_html = _render_index_html()
+
     @app.get("/")
     async def root() -> HTMLResponse:
-        return HTMLResponse(_render_index_html())
+        return HTMLResponse(index_html)
 
     app.include_router(api_router)
-    app.include_router(create_tool_proxy_router(host_client=sdk_host, prefix="/api/sdk"))
+    app.include_router(create_tool_proxy_router(gateway=gateway, prefix="/api/sdk"))
     app.include_router(mcp_router)
-    app.mount("/", StaticFiles(directory=str(web_dir), html=True), name="web")
+
+    web_assets = _load_web_assets(web_dir)
+
+    @app.api_route("/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+    async def web_asset(path: str, request: Request) -> Response:
+        entry = web_assets.get(path) or web_assets.get(posixpath.join(path, "index.html"))
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Not Found")
+        content, etag, media_type, file_path = entry
+        if content is None:
+            return FileResponse(path=str(file_path), media_type=media_type)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=content, media_type=media_type, headers={"ETag": etag})
+
     return app
 
 
+def _parse_cli_args(argv: list[str]) -> tuple[str, int]:
+    host_arg, port_arg = "127.0.0.1", 8080
+    args = iter(argv)
+    for arg in args:
+        name, sep, value = arg.partition("=")
+        if name not in {"--host", "--port"}:
+            continue
+        if not sep:
+            value = next(args, "")
+        if name == "--host":
+            host_arg = value or host_arg
+        elif value:
+            port_arg = int(value)
+    return host_arg, port_arg
+
+
 def main() -> None:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--host", default="127.0.0.1")
-    parser.add_argument("--port", type=int, default=8080)
-    args, _ = parser.parse_known_args()
+    host_arg, port_arg = _parse_cli_args(sys.argv[1:])
 
     base_dir = Path(__file__).parent.parent
     web_dir = base_dir / "web"
@@ -139,7 +298,7 @@ def main() -> None:
 
     import uvicorn
 
-    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+    uvicorn.run(app, host=host_arg, port=port_arg, log_level="info", **uvicorn_loop_options())
 
 
 if __name__ in {"__main__", "__mp_main__"}:
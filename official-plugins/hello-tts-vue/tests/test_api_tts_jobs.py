@@ -25,6 +25,11 @@ class _FakeHostClient:
                 "error": None,
             }
         }
+        self._routes = {
+            ("POST", "/sdk/tools"): self._post_tool,
+            ("GET", "/sdk/tasks"): self._get_task,
+            ("DELETE", "/sdk/tasks"): self._cancel_task,
+        }
 
     async def _call_tool(self, tool_name, arguments=None, timeout=120.0, on_progress=None):
         if tool_name == "dawnchat.tts.list_models":
@@ -62,33 +67,44 @@ class _FakeHostClient:
         raise RuntimeError(f"unexpected tool {tool_name}")
 
     async def _request(self, method, path, json=None, params=None):
-        if method == "POST" and path == "/sdk/tools/call":
-            tool_name = (json or {}).get("tool_name")
-            if tool_name == "dawnchat.tts.synthesize":
-                return {"status": "accepted", "mode": "async", "task_id": "task-ok"}
-            result = await self._call_tool(tool_name, arguments=(json or {}).get("arguments") or {})
-            return {"status": "success", "mode": "sync", "result": {"content": result}}
-
-        if method == "GET" and path.startswith("/sdk/tasks/"):
-            task_id = path.split("/")[-1]
-            task = self._tasks.get(task_id)
-            if not task:
-                raise RuntimeError("task not found")
-            return {"status": "success", "task": task}
-
-        if method == "DELETE" and path.startswith("/sdk/tasks/"):
-            task_id = path.split("/")[-1]
-            task = self._tasks.get(task_id)
-            if not task:
-                raise RuntimeError("task not found")
-            task["status"] = "cancelled"
-            task["error"] = "cancelled by test"
-            return {"status": "success", "message": "cancelled"}
-
-        raise RuntimeError(f"unexpected request: {method} {path}")
+        prefix, _, name = path.rpartition("/")
+        handler = self._routes.get((method, prefix))
+        if handler is None:
+            raise RuntimeError(f"unexpected request: {method} {path}")
+        return await handler(name, json or {})
+
+    async def _post_tool(self, name, body):
+        if name != "call":
+            raise RuntimeError(f"unexpected request: POST /sdk/tools/{name}")
+        tool_name = body.get("tool_name")
+        if tool_name == "dawnchat.tts.synthesize":
+            return {"status": "accepted", "mode": "async", "task_id": "task-ok"}
+        result = await self._call_tool(tool_name, arguments=body.get("arguments") or {})
+        return {"status": "success", "mode": "sync", "result": {"content": result}}
+
+    async def _get_task(self, task_id, _body):
+        task = self._tasks.get(task_id)
+        if not task:
+            raise RuntimeError("task not found")
+        return {"status": "success", "task": task}
+
+    async def _cancel_task(self, task_id, _body):
+        task = self._tasks.get(task_id)
+        if not task:
+            raise RuntimeError("task not found")
+        task["status"] = "cancelled"
+        task["error"] = "cancelled by test"
+        return {"status": "success", "message": "cancelled"}
+
+
+_CACHED_MODULE = None
 
 
 def _load_main_module():
+    global _CACHED_MODULE
+    if _CACHED_MODULE is not None:
+        return _CACHED_MODULE
+
     repo_root = Path(__file__).resolve().parents[3]
     sdk_path = repo_root / "sdk"
     if str(sdk_path) not in sys.path:
@@ -104,9 +120,18 @@ def _load_main_module():
         sys.path.insert(0, src_dir)
 
     spec.loader.exec_module(module)
+    _CACHED_MODULE = module
     return module
 
 
+@pytest.fixture(autouse=True)
+def _reset_main_module_state():
+    module = _load_main_module()
+    original_host = module.host
+    yield
+    module.host = original_host
+
+
 @pytest.mark.asyncio
 async def test_tool_proxy_and_audio_endpoint(tmp_path: Path):
     module = _load_main_module()
@@ -117,6 +142,10 @@ async def test_tool_proxy_and_audio_endpoint(tmp_path: Path):
     app = module.create_app(Path(__file__).resolve().parent.parent, host_client=fake_host)
 
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        health_resp = await client.get("/api/health")
+        assert health_resp.status_code == 200
+        assert health_resp.json() == {"status": "ok"}
+
         models_resp = await client.post(
             "/api/sdk/tools/call",
             json={
@@ -148,6 +177,56 @@ async def test_tool_proxy_and_audio_endpoint(tmp_path: Path):
         assert audio_resp.status_code == 200
         assert audio_resp.content.startswith(b"RIFF")
 
+        cached_audio_resp = await client.get(
+            f"/api/tts/audio/{task_id}",
+            headers={"If-None-Match": audio_resp.headers["etag"]},
+        )
+        assert cached_audio_resp.status_code == 304
+
+        range_resp = await client.get(f"/api/tts/audio/{task_id}", headers={"Range": "bytes=8-11"})
+        assert range_resp.status_code == 206
+        assert range_resp.headers["content-range"] == "bytes 8-11/16"
+        assert range_resp.content == b"WAVE"
+
+        reversed_range_resp = await client.get(f"/api/tts/audio/{task_id}", headers={"Range": "bytes=5-3"})
+        assert reversed_range_resp.status_code == 200
+        assert reversed_range_resp.content == b"RIFF....WAVEfmt "
+
+        multi_range_resp = await client.get(f"/api/tts/audio/{task_id}", headers={"Range": "bytes=0-3,8-11"})
+        assert multi_range_resp.status_code == 206
+        assert multi_range_resp.headers["content-type"].startswith("multipart/byteranges")
+        assert b"RIFF" in multi_range_resp.content and b"WAVE" in multi_range_resp.content
+
+        unsatisfiable_resp = await client.get(f"/api/tts/audio/{task_id}", headers={"Range": "bytes=100-"})
+        assert unsatisfiable_resp.status_code == 416
+
+
+@pytest.mark.asyncio
+async def test_audio_endpoint_picks_up_overwritten_output(tmp_path: Path):
+    module = _load_main_module()
+    output_path = tmp_path / "demo.wav"
+    output_path.write_bytes(b"RIFF....WAVEfmt ")
+    app = module.create_app(Path(__file__).resolve().parent.parent, host_client=_FakeHostClient(output_path))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first_resp = await client.get("/api/tts/audio/task-ok")
+        assert first_resp.status_code == 200
+        old_etag = first_resp.headers["etag"]
+
+        # A later synthesis job reuses the same output path with a longer file.
+        output_path.write_bytes(b"RIFF....WAVEfmt data0123")
+
+        second_resp = await client.get("/api/tts/audio/task-ok", headers={"If-None-Match": old_etag})
+        assert second_resp.status_code == 200
+        assert second_resp.headers["etag"] != old_etag
+        assert second_resp.headers["content-length"] == "24"
+        assert second_resp.content == b"RIFF....WAVEfmt data0123"
+
+        range_resp = await client.get("/api/tts/audio/task-ok", headers={"Range": "bytes=16-"})
+        assert range_resp.status_code == 206
+        assert range_resp.headers["content-range"] == "bytes 16-23/24"
+        assert range_resp.content == b"data0123"
+
 
 @pytest.mark.asyncio
 async def test_audio_not_found_for_task_without_output(tmp_path: Path):
@@ -168,3 +247,58 @@ async def test_audio_not_found_for_task_without_output(tmp_path: Path):
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         response = await client.get("/api/tts/audio/task-no-audio")
         assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_web_assets_served_from_memory_with_etag(tmp_path: Path):
+    module = _load_main_module()
+    web_dir = tmp_path / "web"
+    (web_dir / "assets").mkdir(parents=True)
+    (web_dir / "index.html").write_text('<script src="/assets/app.js"></script>', encoding="utf-8")
+    (web_dir / "assets" / "app.js").write_text("console.log('hi')", encoding="utf-8")
+
+    app = module.create_app(tmp_path, host_client=_FakeHostClient(tmp_path / "demo.wav"))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        asset_resp = await client.get("/assets/app.js")
+        assert asset_resp.status_code == 200
+        assert asset_resp.content == b"console.log('hi')"
+        assert "javascript" in asset_resp.headers["content-type"]
+        etag = asset_resp.headers["etag"]
+
+        cached_resp = await client.get("/assets/app.js", headers={"If-None-Match": etag})
+        assert cached_resp.status_code == 304
+
+        missing_resp = await client.get("/assets/missing.js")
+        assert missing_resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_index_html_rewrites_asset_prefix(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    module = _load_main_module()
+    web_dir = tmp_path / "web"
+    web_dir.mkdir()
+    (web_dir / "index.html").write_text(
+        """<script src="/assets/app.js"></script><link href='/assets/app.css'>""",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("DAWNCHAT_PLUGIN_BASE_PATH", "/plugins/tts/")
+
+    app = module.create_app(tmp_path, host_client=_FakeHostClient(tmp_path / "demo.wav"))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/")
+        assert response.status_code == 200
+        assert response.text == (
+            """<script src="/plugins/tts/assets/app.js"></script><link href='/plugins/tts/assets/app.css'>"""
+        )
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [("", 0.05), ("120", 0.12), ("-5", 0.0), ("fast", 0.05), ("nan", 0.05)],
+)
+def test_task_status_cache_ttl_env_parsing(raw: str, expected: float, monkeypatch: pytest.MonkeyPatch):
+    module = _load_main_module()
+    monkeypatch.setenv("DAWNCHAT_TASK_STATUS_CACHE_MS", raw)
+    assert module._task_status_cache_ttl() == pytest.approx(expected)
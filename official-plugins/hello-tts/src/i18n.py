@@ -1,4 +1,5 @@
 import json
+import os
 from pathlib import Path
 from typing import Dict
 
@@ -7,24 +8,31 @@ class I18n:
     def __init__(self, locale_dir: str = "locales"):
         self.locale_dir = Path(__file__).parent / locale_dir
         self.translations: Dict[str, Dict[str, str]] = {}
+        self._tables: Dict[str, Dict[str, str]] = {}
+        self._en: Dict[str, str] = {}
         self.load_translations()
 
     def load_translations(self) -> None:
-        if not self.locale_dir.exists():
+        try:
+            with os.scandir(self.locale_dir) as entries:
+                files = [entry for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+        except OSError:
             return
-        for file in self.locale_dir.glob("*.json"):
-            lang = file.stem
+        for entry in files:
+            lang = entry.name[: -len(".json")]
             try:
-                self.translations[lang] = json.loads(file.read_text(encoding="utf-8"))
+                with open(entry.path, "rb") as f:
+                    self.translations[lang] = json.loads(f.read())
             except Exception:
                 continue
+        self._en = self.translations.get("en", {})
+        self._tables = {lang: {**self._en, **table} for lang, table in self.translations.items()}
 
     def t(self, key: str, lang: str = "en") -> str:
-        if lang in self.translations and key in self.translations[lang]:
-            return self.translations[lang][key]
-        if "en" in self.translations and key in self.translations["en"]:
-            return self.translations["en"][key]
-        return key
+        return self._tables.get(lang, self._en).get(key, key)
+
+    def table(self, lang: str = "en") -> Dict[str, str]:
+        return self._tables.get(lang, self._en)
 
 
 i18n = I18n()
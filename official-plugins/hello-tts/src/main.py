@@ -1,21 +1,33 @@
 import argparse
 import asyncio
+import functools
 import json
 import logging
+import os
 import sys
-from hashlib import md5
+import time
+from hashlib import blake2b
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
 
+from fastapi import HTTPException
+from fastapi.responses import FileResponse
 from nicegui import app, ui
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from dawnchat_sdk import host, setup_plugin_logging
 from dawnchat_sdk.ui import (
+    DARK_THEME,
+    LIGHT_THEME,
     Card,
     Header,
     MutedText,
     setup_dawnchat_ui,
-    get_theme,
 )
 from i18n import i18n
 
@@ -26,25 +38,40 @@ SRC_DIR = Path(__file__).parent
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
+_READY_LINE = b'{"status": "ready"}\n'
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--host", default="127.0.0.1")
-    parser.add_argument("--port", type=int, default=8080)
-    args, _ = parser.parse_known_args()
+# Model/voice/speaker catalogs change rarely; reuse them across pages for a while.
+_CATALOG_CACHE_TTL = 30.0
+_CATALOG_CALL_CONCURRENCY = 8
+_AUDIO_PROBE_TTL = 5.0
+_AUDIO_PROBE_CACHE_SIZE = 256
 
-    @ui.page("/")
-    async def index(theme: str = "dark", lang: str = "zh"):
-        is_dark = str(theme).lower() == "dark"
-        setup_dawnchat_ui(dark=is_dark)
-        theme_obj = get_theme()
-        c = theme_obj.colors
+_TEXT_KEYS = (
+    "title", "subtitle", "engine", "model", "speaker", "quality", "mode", "text",
+    "text_placeholder", "refresh", "synthesize", "output", "play", "pause", "loading",
+    "empty_models", "empty_voices", "empty_speakers", "success", "failed",
+)
 
-        def _t(key: str) -> str:
-            return i18n.t(key, lang)
+_LABEL_STYLES = {
+    True: f"color:{DARK_THEME.text_secondary};",
+    False: f"color:{LIGHT_THEME.text_secondary};",
+}
+_TITLE_STYLES = {
+    True: f"color:{DARK_THEME.text_primary};",
+    False: f"color:{LIGHT_THEME.text_primary};",
+}
 
-        ui.add_head_html(
-            f"""
+
+def _pretty_json(payload: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, indent=2)
+
+
+@functools.lru_cache(maxsize=2)
+def _head_css(is_dark: bool) -> str:
+    c = DARK_THEME if is_dark else LIGHT_THEME
+    return f"""
             <style>
                 body {{
                     background-color: {c.bg_primary} !important;
@@ -60,15 +87,60 @@ def main():
                 }}
             </style>
             """
-        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args, _ = parser.parse_known_args()
+
+    # Synthesized files are served by one fixed route; each output directory just
+    # gets a short token so the route table does not grow with every new directory.
+    audio_tokens: Dict[str, str] = {}
+    audio_dirs: Dict[str, Path] = {}
+    # output path -> (checked at, resolved parent directory or None if missing)
+    audio_probes: Dict[str, Tuple[float, Optional[str]]] = {}
+
+    @app.get("/hello-tts-audio/{token}/{filename}")
+    def hello_tts_audio(token: str, filename: str):
+        directory = audio_dirs.get(token)
+        if directory is None or filename in (".", ".."):
+            raise HTTPException(status_code=404)
+        path = directory / filename
+        if not path.is_file():
+            raise HTTPException(status_code=404)
+        return FileResponse(path)
+
+    catalog_cache: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Tuple[float, Dict[str, Any]]] = {}
+    # host.tools already reuses one pooled HTTP client; this just bounds how many
+    # catalog requests all open pages can have in flight against the host at once.
+    catalog_call_limit = asyncio.Semaphore(_CATALOG_CALL_CONCURRENCY)
+
+    @ui.page("/")
+    async def index(theme: str = "dark", lang: str = "zh"):
+        is_dark = str(theme).lower() == "dark"
+        setup_dawnchat_ui(dark=is_dark)
+
+        texts = i18n.table(lang)
+        labels = SimpleNamespace(**{key: texts.get(key, key) for key in _TEXT_KEYS})
+        notify_success = {"message": labels.success, "type": "positive"}
+        notify_failed = {"message": labels.failed, "type": "negative"}
+
+        ui.add_head_html(_head_css(is_dark))
+        label_style = _LABEL_STYLES[is_dark]
+        title_style = _TITLE_STYLES[is_dark]
 
         engine_options = {"vibevoice": "VibeVoice", "cosyvoice": "CosyVoice"}
         quality_options = {"fast": "fast", "standard": "standard", "high": "high"}
         mode_options = {"sft": "sft", "zero_shot": "zero_shot", "instruct2": "instruct2"}
         state: Dict[str, Any] = {
             "models": [],
-            "voices": {},
+            "valid_model_ids": set(),
+            "voices_by_quality": {},
+            "all_voices": [],
             "models_loading": False,
+            "refresh_voices_task": None,
         }
         synth_button = None
 
@@ -112,17 +184,32 @@ def main():
                 logger.exception("tool call failed: %s", name)
                 raise
 
+        async def _call_catalog_tool(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+            key = (name, tuple(sorted(arguments.items())))
+            cached = catalog_cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < _CATALOG_CACHE_TTL:
+                return cached[1]
+            async with catalog_call_limit:
+                # Another page may have filled the entry while this one was waiting.
+                cached = catalog_cache.get(key)
+                now = time.monotonic()
+                if cached is not None and now - cached[0] < _CATALOG_CACHE_TTL:
+                    return cached[1]
+                resp = await _call_tool(name, arguments)
+            if resp.get("code") == 200:
+                catalog_cache[key] = (now, resp)
+            return resp
+
         def _build_model_options(models: List[Dict[str, Any]]) -> Dict[str, str]:
             options: Dict[str, str] = {}
             for m in models:
-                mid = str(m.get("model_id") or m.get("id") or m.get("size") or "").strip()
+                mid = m.get("model_id") or m.get("id") or m.get("size") or ""
+                mid = (mid if isinstance(mid, str) else str(mid)).strip()
                 if not mid:
                     continue
-                name = str(m.get("name") or mid).strip()
-                installed = bool(m.get("installed"))
-                suffix = "✅" if installed else "⏳"
-                label = f"{name} {suffix}"
-                options[mid] = label
+                name = m.get("name") or mid
+                name = (name if isinstance(name, str) else str(name)).strip()
+                options[mid] = name + (" ✅" if m.get("installed") else " ⏳")
             return options
 
         def _apply_select_options(select, options: Dict[str, str], fallback: str) -> None:
@@ -134,19 +221,19 @@ def main():
                 select.value = next(iter(options.keys()))
             select.update()
 
+        def _set_models(models: List[Dict[str, Any]]) -> None:
+            state["models"] = models
+            state["valid_model_ids"] = {
+                value
+                for model in models
+                if isinstance(model, dict)
+                for key in ("model_id", "id", "size")
+                if (value := str(model.get(key) or "").strip())
+            }
+
         def _valid_model_id(model_id: Optional[str]) -> Optional[str]:
             candidate = str(model_id or "").strip()
-            if not candidate:
-                return None
-            valid_ids = set()
-            for model in state.get("models", []):
-                if not isinstance(model, dict):
-                    continue
-                for key in ("model_id", "id", "size"):
-                    value = str(model.get(key) or "").strip()
-                    if value:
-                        valid_ids.add(value)
-            return candidate if candidate in valid_ids else None
+            return candidate if candidate in state["valid_model_ids"] else None
 
         def _preferred_cosy_model_id(models: List[Dict[str, Any]]) -> Optional[str]:
             installed_id = None
@@ -201,135 +288,181 @@ def main():
                 return fallback
             return None
 
+        async def _fetch_cosyvoice_models() -> List[Dict[str, Any]]:
+            resp = await _call_catalog_tool("dawnchat.tts.list_models", {"engine": "cosyvoice"})
+            models = resp.get("data", {}).get("models", []) if resp.get("code") == 200 else []
+            return models if isinstance(models, list) else []
+
+        async def load_initial_catalogs() -> None:
+            # The default engine only needs the VibeVoice voices; warm the CosyVoice
+            # model list alongside it so the first engine switch skips a round-trip.
+            # Only the prefetch is best-effort; a refresh_models() failure still propagates.
+            async def prefetch_cosyvoice_models() -> None:
+                try:
+                    await _fetch_cosyvoice_models()
+                except Exception as exc:
+                    logger.warning("list_models prefetch failed: %s", exc)
+
+            await asyncio.gather(prefetch_cosyvoice_models(), refresh_models())
+
+        async def reload_catalogs() -> None:
+            catalog_cache.clear()
+            await refresh_models()
+
         async def refresh_models() -> None:
             engine = _engine_value()
-            state["models"] = []
+            _set_models([])
             state["models_loading"] = engine == "cosyvoice"
             _update_synthesize_enabled()
-            model_select.options = {"": _t("loading")}
+            model_select.options = {"": labels.loading}
             model_select.value = ""
             model_select.update()
             if engine != "cosyvoice":
                 state["models_loading"] = False
-                _apply_select_options(model_select, {"": _t("empty_models")}, _t("empty_models"))
-                await refresh_voices()
+                _apply_select_options(model_select, {"": labels.empty_models}, labels.empty_models)
+                await _refresh_voices_and_wait()
                 _update_synthesize_enabled()
                 return
             try:
-                resp = await _call_tool("dawnchat.tts.list_models", {"engine": engine})
-                models = resp.get("data", {}).get("models", []) if resp.get("code") == 200 else []
-                if not isinstance(models, list):
-                    models = []
-                state["models"] = models
+                models = await _fetch_cosyvoice_models()
+                _set_models(models)
                 options = _build_model_options(models)
-                _apply_select_options(model_select, options, _t("empty_models"))
+                _apply_select_options(model_select, options, labels.empty_models)
                 preferred = _preferred_cosy_model_id(models)
                 if preferred and preferred in model_select.options:
                     model_select.value = preferred
                     model_select.update()
-                await refresh_voices()
+                await _refresh_voices_and_wait()
             except Exception as exc:
                 logger.warning("list_models failed: %s", exc)
-                state["models"] = []
-                _apply_select_options(model_select, {"": _t("empty_models")}, _t("empty_models"))
+                _set_models([])
+                _apply_select_options(model_select, {"": labels.empty_models}, labels.empty_models)
             finally:
                 state["models_loading"] = False
                 _update_synthesize_enabled()
 
-        def _extract_vibevoice_voices(payload: Dict[str, Any]) -> List[str]:
+        def _clean_voice_list(raw: Any) -> List[str]:
+            if not isinstance(raw, list):
+                return []
+            return [name for v in raw if (name := str(v).strip())]
+
+        def _index_vibevoice_voices(payload: Dict[str, Any]) -> None:
             by_quality = payload.get("by_quality")
-            if isinstance(by_quality, dict):
-                candidates = by_quality.get(_quality_value())
-                if isinstance(candidates, list):
-                    return [str(v).strip() for v in candidates if str(v).strip()]
-            raw = payload.get("voices")
-            if isinstance(raw, list):
-                return [str(v).strip() for v in raw if str(v).strip()]
-            return []
+            state["voices_by_quality"] = {
+                quality: _clean_voice_list(voices)
+                for quality, voices in (by_quality.items() if isinstance(by_quality, dict) else ())
+                if isinstance(voices, list)
+            }
+            state["all_voices"] = _clean_voice_list(payload.get("voices"))
+
+        def _render_vibevoice_voices() -> None:
+            candidates = state["voices_by_quality"].get(_quality_value())
+            if candidates is None:
+                candidates = state["all_voices"]
+            options = {v: v for v in candidates}
+            _apply_select_options(speaker_select, options, labels.empty_voices)
 
         async def refresh_voices() -> None:
             engine = _engine_value()
-            speaker_select.options = {"": _t("loading")}
+            speaker_select.options = {"": labels.loading}
             speaker_select.value = ""
             speaker_select.update()
             try:
                 if engine == "cosyvoice":
                     model_id = _valid_model_id(_model_value())
                     if not model_id:
-                        _apply_select_options(speaker_select, {}, _t("empty_speakers"))
+                        _apply_select_options(speaker_select, {}, labels.empty_speakers)
                         return
-                    resp = await _call_tool(
+                    resp = await _call_catalog_tool(
                         "dawnchat.tts.list_speakers",
                         {"engine": "cosyvoice", "model_id": model_id},
                     )
                     speakers = resp.get("data", {}).get("speakers", []) if resp.get("code") == 200 else []
                     candidates = [str(v).strip() for v in speakers if str(v).strip()]
                     options = {v: v for v in candidates}
-                    _apply_select_options(speaker_select, options, _t("empty_speakers"))
+                    _apply_select_options(speaker_select, options, labels.empty_speakers)
                     return
 
-                resp = await _call_tool("dawnchat.tts.list_voices", {"engine": "vibevoice"})
+                resp = await _call_catalog_tool("dawnchat.tts.list_voices", {"engine": "vibevoice"})
                 payload = resp.get("data", {}) if resp.get("code") == 200 else {}
-                state["voices"] = payload if isinstance(payload, dict) else {}
-                candidates = _extract_vibevoice_voices(state["voices"])
-                options = {v: v for v in candidates}
-                _apply_select_options(speaker_select, options, _t("empty_voices"))
+                _index_vibevoice_voices(payload if isinstance(payload, dict) else {})
+                _render_vibevoice_voices()
             except Exception as exc:
                 logger.warning("list_voices failed: %s", exc)
-                _apply_select_options(speaker_select, {}, _t("empty_voices"))
-
-        def _audio_url(path: str) -> Optional[str]:
+                _apply_select_options(speaker_select, {}, labels.empty_voices)
+
+        def _schedule_refresh_voices() -> "asyncio.Task[None]":
+            # Only the latest selection matters; drop any refresh still waiting on the host.
+            previous = state["refresh_voices_task"]
+            if previous is not None and not previous.done():
+                previous.cancel()
+            task = asyncio.create_task(refresh_voices())
+            state["refresh_voices_task"] = task
+            return task
+
+        async def _refresh_voices_and_wait() -> None:
+            # asyncio.wait instead of await: a newer refresh may cancel this one, and
+            # that is not an error for the caller.
+            await asyncio.wait([_schedule_refresh_voices()])
+
+        def _probe_audio(p: Path) -> Optional[str]:
+            return str(p.parent.resolve()) if p.exists() else None
+
+        async def _audio_url(path: str) -> Optional[str]:
             if not path:
                 return None
             p = Path(path)
-            if not p.exists():
+            now = time.monotonic()
+            probe = audio_probes.get(path)
+            if probe is not None and now - probe[0] < _AUDIO_PROBE_TTL:
+                directory = probe[1]
+            else:
+                directory = await asyncio.to_thread(_probe_audio, p)
+                if len(audio_probes) >= _AUDIO_PROBE_CACHE_SIZE:
+                    audio_probes.clear()
+                audio_probes[path] = (now, directory)
+            if directory is None:
                 return None
-            token = md5(str(p).encode("utf-8")).hexdigest()[:10]
-            route = f"/hello-tts-audio/{token}"
-            app.add_static_files(route, str(p.parent))
-            return f"{route}/{p.name}"
+            token = audio_tokens.get(directory)
+            if token is None:
+                token = blake2b(directory.encode("utf-8"), digest_size=5).hexdigest()
+                audio_tokens[directory] = token
+                audio_dirs[token] = Path(directory)
+            return f"/hello-tts-audio/{token}/{p.name}"
 
         def _render_audio(url: Optional[str]) -> None:
-            audio_container.clear()
-            if not url:
-                play_button.set_enabled(False)
-                pause_button.set_enabled(False)
-                return
-            with audio_container:
-                ui.audio(url).props('controls id="hello-tts-player"').classes("w-full")
-            play_button.set_enabled(True)
-            pause_button.set_enabled(True)
+            if url:
+                audio_player.set_source(url)
+            audio_player.set_visibility(bool(url))
+            play_button.set_enabled(bool(url))
+            pause_button.set_enabled(bool(url))
 
         def _render_result(payload: Dict[str, Any]) -> None:
             result_container.clear()
-            pretty = json.dumps(payload, ensure_ascii=False, indent=2)
+            pretty = _pretty_json(payload)
             with result_container:
                 ui.code(pretty).classes("w-full")
 
         def _render_output_info(payload: Dict[str, Any]) -> None:
-            output_container.clear()
-            data = payload.get("data") if isinstance(payload, dict) else {}
-            if not isinstance(data, dict):
-                return
-            output_path = str(data.get("output_path") or "").strip()
-            if not output_path:
-                return
-            with output_container:
-                ui.label(output_path).classes("text-xs").style(f"color:{c.text_secondary};")
+            data = payload.get("data") if isinstance(payload, dict) else None
+            output_path = str(data.get("output_path") or "").strip() if isinstance(data, dict) else ""
+            if output_path:
+                output_path_label.set_text(output_path)
+            output_path_label.set_visibility(bool(output_path))
 
         async def synthesize() -> None:
             text = str(text_input.value or "").strip()
             if not text:
-                ui.notify(_t("text_placeholder"), type="warning")
+                ui.notify(labels.text_placeholder, type="warning")
                 return
 
             result_container.clear()
-            output_container.clear()
+            output_path_label.set_visibility(False)
             progress_bar = None
             progress_label = None
             with result_container:
                 progress_bar = ui.linear_progress(value=0).classes("w-full mb-2")
-                progress_label = ui.label(_t("loading")).classes("text-sm").style(f"color:{c.text_secondary};")
+                progress_label = ui.label(labels.loading).classes("text-sm").style(label_style)
 
             engine = _engine_value()
             speaker = str(speaker_select.value or "").strip()
@@ -340,7 +473,7 @@ def main():
 
             if engine == "cosyvoice":
                 if bool(state.get("models_loading")):
-                    ui.notify(_t("loading"), type="warning")
+                    ui.notify(labels.loading, type="warning")
                     return
                 if speaker:
                     args["speaker"] = speaker
@@ -352,7 +485,7 @@ def main():
                 if model_id:
                     args["model_id"] = model_id
                 else:
-                    ui.notify(_t("empty_models"), type="warning")
+                    ui.notify(labels.empty_models, type="warning")
                     return
                 args["mode"] = str(mode_select.value or "instruct2").strip().lower() or "instruct2"
             else:
@@ -368,7 +501,7 @@ def main():
                         normalized = normalized / 100.0
                     normalized = max(0.0, min(1.0, normalized))
                     progress_bar.value = normalized
-                    progress_label.text = f"{message or _t('loading')} ({int(normalized * 100)}%)"
+                    progress_label.text = f"{message or labels.loading} ({int(normalized * 100)}%)"
 
                 resp = await _call_tool("dawnchat.tts.synthesize", args, on_progress=on_progress)
             except Exception as exc:
@@ -379,21 +512,21 @@ def main():
 
             if isinstance(resp, dict) and resp.get("code") == 200:
                 data = resp.get("data") or {}
-                url = _audio_url(str(data.get("output_path") or ""))
+                url = await _audio_url(str(data.get("output_path") or ""))
                 _render_audio(url)
-                ui.notify(_t("success"), type="positive")
+                ui.notify(**notify_success)
             else:
-                ui.notify(_t("failed"), type="negative")
+                ui.notify(**notify_failed)
 
         with ui.column().classes("w-full items-center gap-6 p-4"):
             with Card().classes("w-full max-w-4xl text-center"):
-                Header(_t("title"))
-                MutedText(_t("subtitle"))
+                Header(labels.title)
+                MutedText(labels.subtitle)
 
             with ui.row().classes("w-full max-w-4xl gap-6 flex-wrap"):
                 with ui.column().classes("flex-1 min-w-80"):
                     with ui.element("div").classes("tts-card"):
-                        ui.label(_t("engine")).classes("text-sm").style(f"color:{c.text_secondary};")
+                        ui.label(labels.engine).classes("text-sm").style(label_style)
                         engine_select = ui.select(
                             options=engine_options,
                             value="vibevoice",
@@ -401,23 +534,23 @@ def main():
 
                         model_container = ui.element("div").classes("w-full")
                         with model_container:
-                            ui.label(_t("model")).classes("text-sm mt-3").style(f"color:{c.text_secondary};")
+                            ui.label(labels.model).classes("text-sm mt-3").style(label_style)
 
                             def _model_changed() -> None:
                                 if _engine_value() != "cosyvoice":
                                     return
                                 _update_synthesize_enabled()
-                                asyncio.create_task(refresh_voices())
+                                _schedule_refresh_voices()
 
                             model_select = ui.select(
-                                options={"": _t("loading")},
+                                options={"": labels.loading},
                                 value="",
                                 on_change=lambda e: _model_changed(),
                             ).props("outlined dense").classes("w-full")
 
-                        ui.label(_t("speaker")).classes("text-sm mt-3").style(f"color:{c.text_secondary};")
+                        ui.label(labels.speaker).classes("text-sm mt-3").style(label_style)
                         speaker_select = ui.select(
-                            options={"": _t("loading")},
+                            options={"": labels.loading},
                             value="",
                         ).props("outlined dense").classes("w-full")
 
@@ -425,11 +558,14 @@ def main():
                         mode_container = ui.element("div").classes("w-full")
 
                         with quality_container:
-                            ui.label(_t("quality")).classes("text-sm mt-3").style(f"color:{c.text_secondary};")
+                            ui.label(labels.quality).classes("text-sm mt-3").style(label_style)
                             def _quality_changed() -> None:
                                 if _engine_value() != "vibevoice":
                                     return
-                                asyncio.create_task(refresh_voices())
+                                if state["voices_by_quality"] or state["all_voices"]:
+                                    _render_vibevoice_voices()
+                                    return
+                                _schedule_refresh_voices()
                             quality_select = ui.select(
                                 options=quality_options,
                                 value="fast",
@@ -437,7 +573,7 @@ def main():
                             ).props("outlined dense").classes("w-full")
 
                         with mode_container:
-                            ui.label(_t("mode")).classes("text-sm mt-3").style(f"color:{c.text_secondary};")
+                            ui.label(labels.mode).classes("text-sm mt-3").style(label_style)
                             mode_select = ui.select(
                                 options=mode_options,
                                 value="instruct2",
@@ -457,41 +593,44 @@ def main():
                             _update_synthesize_enabled()
                             asyncio.create_task(refresh_models())
 
-                        ui.label(_t("text")).classes("text-sm mt-4").style(f"color:{c.text_secondary};")
+                        ui.label(labels.text).classes("text-sm mt-4").style(label_style)
                         text_input = ui.textarea(
-                            placeholder=_t("text_placeholder"),
+                            placeholder=labels.text_placeholder,
                             value="",
                         ).classes("w-full").props("outlined")
 
                         with ui.row().classes("w-full items-center gap-3 mt-4"):
-                            ui.button(_t("refresh"), on_click=refresh_models).props("outline")
-                            synth_button = ui.button(_t("synthesize"), on_click=synthesize).props("color=primary")
+                            ui.button(labels.refresh, on_click=reload_catalogs).props("outline")
+                            synth_button = ui.button(labels.synthesize, on_click=synthesize).props("color=primary")
 
                 with ui.column().classes("flex-1 min-w-80"):
                     with ui.element("div").classes("tts-card"):
-                        ui.label(_t("output")).classes("text-lg font-semibold").style(f"color:{c.text_primary};")
+                        ui.label(labels.output).classes("text-lg font-semibold").style(title_style)
                         result_container = ui.element("div").classes("w-full mt-3")
                         output_container = ui.element("div").classes("w-full mt-4")
-                        audio_container = ui.element("div").classes("w-full mt-3")
+                        audio_player = ui.audio("").props('id="hello-tts-player"').classes("w-full mt-3")
+                        audio_player.set_visibility(False)
 
                         with output_container:
                             with ui.row().classes("w-full items-center gap-3"):
                                 play_button = ui.button(
-                                    _t("play"),
+                                    labels.play,
                                     on_click=lambda: ui.run_javascript("document.getElementById('hello-tts-player')?.play();"),
                                 ).props("outline")
                                 pause_button = ui.button(
-                                    _t("pause"),
+                                    labels.pause,
                                     on_click=lambda: ui.run_javascript("document.getElementById('hello-tts-player')?.pause();"),
                                 ).props("outline")
                                 play_button.set_enabled(False)
                                 pause_button.set_enabled(False)
+                            output_path_label = ui.label("").classes("text-xs").style(label_style)
+                            output_path_label.set_visibility(False)
 
-        await refresh_models()
+        await load_initial_catalogs()
         _update_synthesize_enabled()
 
     def on_startup():
-        print(json.dumps({"status": "ready"}), file=sys.stderr, flush=True)
+        os.write(2, _READY_LINE)
 
     app.on_startup(on_startup)
 
@@ -1,12 +1,31 @@
 import argparse
-import json
+import functools
+import os
 import sys
 from nicegui import ui, app
 
-from dawnchat_sdk.ui import setup_dawnchat_ui, get_theme
+from dawnchat_sdk.ui import setup_dawnchat_ui, DARK_THEME, LIGHT_THEME
 
 from i18n import i18n
 
+# Readiness line PluginManager waits for on stderr
+_READY_LINE = b'{"status": "ready"}\n'
+
+# Widget style strings only depend on the theme, so build them once per mode.
+# setup_dawnchat_ui itself still runs per page: it injects head HTML for that client.
+@functools.lru_cache(maxsize=2)
+def _page_styles(is_dark):
+    c = DARK_THEME if is_dark else LIGHT_THEME
+    return {
+        'page': f'background-color: {c.bg_primary};',
+        'card': f'background-color: {c.bg_secondary}; border: 1px solid {c.border};',
+        'icon': f'color: {c.primary};',
+        'text': f'color: {c.text_primary};',
+        'muted': f'color: {c.text_secondary};',
+        'input': f'--q-field-bg: {c.bg_secondary}; color: {c.text_primary};',
+        'button': f'background-color: {c.primary}; color: white;',
+    }
+
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser()
@@ -14,45 +33,45 @@ def main():
     parser.add_argument("--port", type=int, default=8080)
     # Ignore unknown args to avoid conflicts
     args, _ = parser.parse_known_args()
+    debug_lines = (f'Host: {args.host}', f'Port: {args.port}', f'Python: {sys.version.split()[0]}')
 
     # Define the UI
     @ui.page('/')
     def index(theme: str = 'dark', lang: str = 'zh'):
         is_dark = str(theme).lower() == 'dark'
         setup_dawnchat_ui(dark=is_dark)
-        theme_obj = get_theme()
-        c = theme_obj.colors
+        styles = _page_styles(is_dark)
+
+        texts = i18n.table(lang)
 
         def _t(key):
-            return i18n.t(key, lang)
+            return texts.get(key, key)
 
-        with ui.column().classes('w-full h-screen items-center justify-center').style(f'background-color: {c.bg_primary};'):
+        with ui.column().classes('w-full h-screen items-center justify-center').style(styles['page']):
 
-            with ui.card().classes('w-96 p-6 shadow-xl').style(f'background-color: {c.bg_secondary}; border: 1px solid {c.border};'):
+            with ui.card().classes('w-96 p-6 shadow-xl').style(styles['card']):
                 with ui.row().classes('w-full items-center justify-center mb-4'):
-                    ui.icon('waving_hand', size='4rem').style(f'color: {c.primary};')
+                    ui.icon('waving_hand', size='4rem').style(styles['icon'])
                 
-                ui.label(_t('title')).classes('text-3xl font-bold text-center w-full mb-1').style(f'color: {c.text_primary};')
-                ui.label(_t('subtitle')).classes('text-sm text-center w-full mb-6').style(f'color: {c.text_secondary};')
+                ui.label(_t('title')).classes('text-3xl font-bold text-center w-full mb-1').style(styles['text'])
+                ui.label(_t('subtitle')).classes('text-sm text-center w-full mb-6').style(styles['muted'])
                 
-                name_input = ui.input(label=_t('label')).classes('w-full mb-4').style(
-                    f'--q-field-bg: {c.bg_secondary}; color: {c.text_primary};'
-                )
+                name_input = ui.input(label=_t('label')).classes('w-full mb-4').style(styles['input'])
                 
+                notify_tmpl = _t('notify')
+
                 def greet():
-                    name = name_input.value or "Stranger"
-                    ui.notify(_t('notify').format(name), type='positive')
+                    ui.notify(notify_tmpl.format(name_input.value or "Stranger"), type='positive')
                 
-                ui.button(_t('btn'), on_click=greet).classes('w-full').style(f'background-color: {c.primary}; color: white;')
+                ui.button(_t('btn'), on_click=greet).classes('w-full').style(styles['button'])
                 
-                with ui.expansion(_t('debug'), icon='info').classes('w-full mt-4').style(f'color: {c.text_primary};'):
-                    ui.label(f'Host: {args.host}').style(f'color: {c.text_secondary};')
-                    ui.label(f'Port: {args.port}').style(f'color: {c.text_secondary};')
-                    ui.label(f'Python: {sys.version.split()[0]}').style(f'color: {c.text_secondary};')
+                with ui.expansion(_t('debug'), icon='info').classes('w-full mt-4').style(styles['text']):
+                    for line in debug_lines:
+                        ui.label(line).style(styles['muted'])
 
     # Register startup callback to signal readiness to PluginManager
     def on_startup():
-        print(json.dumps({"status": "ready"}), file=sys.stderr, flush=True)
+        os.write(2, _READY_LINE)
 
     app.on_startup(on_startup)
 
@@ -11,16 +11,18 @@ import argparse
 import asyncio
 import json
 import sys
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 
 from nicegui import ui, app
 from i18n import i18n
 
 # Import DawnChat SDK
-from dawnchat_sdk import host
+from dawnchat_sdk import CoalescedFetch, host, uvicorn_loop_options
 from dawnchat_sdk.ui import (
     setup_dawnchat_ui,
-    get_theme,
+    DARK_THEME,
+    LIGHT_THEME,
     Card,
     PrimaryButton,
     SecondaryButton,
@@ -34,29 +36,18 @@ from dawnchat_sdk.ui import (
 from dawnchat_sdk.ui.components import ResultCard, LoadingSpinner
 from dawnchat_sdk.ui.theme import create_theme_toggle
 
+# Tool list virtualization: only a window of rows is materialized and recycled
+# while scrolling, so the DOM stays O(viewport) however many tools the host has.
+TOOL_ROW_PX = 32
+TOOL_VIEWPORT_PX = 200
+TOOL_ROW_BUFFER = 3
+TOOL_ROW_POOL = TOOL_VIEWPORT_PX // TOOL_ROW_PX + 2 * TOOL_ROW_BUFFER
+TOOLS_LIST_TTL = 5.0
 
-def main():
-    # Parse command line arguments
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--host", default="127.0.0.1")
-    parser.add_argument("--port", type=int, default=8080)
-    args, _ = parser.parse_known_args()
-
-    @ui.page('/')
-    async def index(theme: str = 'dark', lang: str = 'zh'):
-        # Setup DawnChat UI theme (injects CSS and sets dark mode)
-        is_dark = str(theme).lower() == 'dark'
-        setup_dawnchat_ui(dark=is_dark)
-        
-        # Simple i18n
-        def _t(key):
-            return i18n.t(key, lang)
 
-        theme_obj = get_theme()
-        c = theme_obj.colors
-        
-        # Add custom CSS for this page
-        ui.add_head_html(f"""
+def _build_styles(c):
+    return {
+        'head_css': f"""
         <style>
             body {{
                 background-color: {c.bg_primary} !important;
@@ -78,7 +69,81 @@ def main():
                 overflow-y: auto;
             }}
         </style>
-        """)
+        """,
+        'panel': (
+            f'background-color: {c.bg_secondary}; '
+            f'border: 1px solid {c.border}; '
+            f'border-radius: 0.5rem; '
+            f'padding: 1.5rem;'
+        ),
+        'result_success': (
+            f'background-color: {c.bg_primary}; '
+            f'border: 1px solid {c.success}; '
+            f'border-radius: 0.5rem; '
+            f'padding: 1rem;'
+        ),
+        'result_error': (
+            f'background-color: {c.bg_primary}; '
+            f'border: 1px solid {c.danger}; '
+            f'border-radius: 0.5rem; '
+            f'padding: 1rem;'
+        ),
+        'button_primary': f'background-color: {c.primary}; color: white;',
+        'button_warning': f'background-color: {c.warning}; color: white;',
+        'button_outline': f'color: {c.text_primary}; border-color: {c.border};',
+        'input': f'--q-field-bg: {c.bg_primary};',
+        'icon_primary': f'color: {c.primary};',
+        'icon_warning': f'color: {c.warning};',
+        'text': f'color: {c.text_primary};',
+        'muted': f'color: {c.text_secondary};',
+        'success': f'color: {c.success};',
+        'danger': f'color: {c.danger};',
+        'divider': f'border-top: 1px solid {c.border};',
+        'footer': f'color: {c.text_disabled};',
+    }
+
+
+# Page CSS and widget styles only depend on the palette, so build both themes once.
+_STYLES_BY_THEME = {True: _build_styles(DARK_THEME), False: _build_styles(LIGHT_THEME)}
+
+# Handlers run on the event loop thread, so the cached second needs no lock.
+_iso_now_cache = {'second': -1, 'iso': ''}
+
+
+def fast_iso_now():
+    """Current UTC time as ISO 8601, formatted at most once per second."""
+    second = int(time.time())
+    if second != _iso_now_cache['second']:
+        _iso_now_cache['iso'] = datetime.fromtimestamp(second, tz=timezone.utc).isoformat()
+        _iso_now_cache['second'] = second
+    return _iso_now_cache['iso']
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args, _ = parser.parse_known_args()
+
+    # Pages listing tools at the same time share one host.tools.list() call,
+    # and its result is reused for a few seconds.
+    host_tools = CoalescedFetch(lambda: host.tools.list(), ttl=TOOLS_LIST_TTL)
+
+    @ui.page('/')
+    async def index(theme: str = 'dark', lang: str = 'zh'):
+        # Setup DawnChat UI theme (injects CSS and sets dark mode)
+        is_dark = str(theme).lower() == 'dark'
+        setup_dawnchat_ui(dark=is_dark)
+        
+        # Simple i18n
+        def _t(key):
+            return i18n.t(key, lang)
+
+        styles = _STYLES_BY_THEME[is_dark]
+        
+        # Add custom CSS for this page
+        ui.add_head_html(styles['head_css'])
         
         with ui.column().classes('w-full items-center gap-6 p-4'):
             # Header
@@ -91,25 +156,18 @@ def main():
                 
                 # === Left Column: AI Chat Demo ===
                 with ui.column().classes('flex-1 min-w-80'):
-                    with ui.card().classes('w-full').style(
-                        f'background-color: {c.bg_secondary}; '
-                        f'border: 1px solid {c.border}; '
-                        f'border-radius: 0.5rem; '
-                        f'padding: 1.5rem;'
-                    ):
+                    with ui.card().classes('w-full').style(styles['panel']):
                         with ui.row().classes('items-center gap-2 mb-4'):
-                            ui.icon('smart_toy', size='1.5rem').style(f'color: {c.primary};')
-                            ui.label(_t('ai_demo')).classes('text-lg font-semibold').style(f'color: {c.text_primary};')
+                            ui.icon('smart_toy', size='1.5rem').style(styles['icon_primary'])
+                            ui.label(_t('ai_demo')).classes('text-lg font-semibold').style(styles['text'])
                         
-                        ui.label(_t('ai_desc')).classes('text-sm mb-4').style(f'color: {c.text_secondary};')
+                        ui.label(_t('ai_desc')).classes('text-sm mb-4').style(styles['muted'])
                         
                         ai_input = ui.textarea(
                             label=_t('ai_input_label'),
                             placeholder=_t('ai_input_placeholder'),
                             value=_t('ai_default_text')
-                        ).classes('w-full mb-4').style(
-                            f'--q-field-bg: {c.bg_primary};'
-                        )
+                        ).classes('w-full mb-4').style(styles['input'])
                         
                         ai_result_container = ui.element('div').classes('w-full')
                         ai_loading = ui.element('div').classes('w-full')
@@ -124,8 +182,8 @@ def main():
                             
                             with ai_loading:
                                 with ui.row().classes('items-center gap-2'):
-                                    ui.spinner(size='sm').style(f'color: {c.primary};')
-                                    ui.label(_t('ai_loading')).style(f'color: {c.text_secondary};')
+                                    ui.spinner(size='sm').style(styles['icon_primary'])
+                                    ui.label(_t('ai_loading')).style(styles['muted'])
                             
                             try:
                                 # Call AI via SDK
@@ -140,20 +198,15 @@ def main():
                                 ai_loading.clear()
                                 
                                 with ai_result_container:
-                                    with ui.element('div').style(
-                                        f'background-color: {c.bg_primary}; '
-                                        f'border: 1px solid {c.success}; '
-                                        f'border-radius: 0.5rem; '
-                                        f'padding: 1rem;'
-                                    ):
+                                    with ui.element('div').style(styles['result_success']):
                                         with ui.row().classes('items-center gap-2 mb-2'):
-                                            ui.icon('check_circle').style(f'color: {c.success};')
-                                            ui.label(_t('ai_response')).classes('font-semibold').style(f'color: {c.text_primary};')
+                                            ui.icon('check_circle').style(styles['success'])
+                                            ui.label(_t('ai_response')).classes('font-semibold').style(styles['text'])
                                         
-                                        ui.label(response.get('content', 'No response')).style(f'color: {c.text_primary};')
+                                        ui.label(response.get('content', 'No response')).style(styles['text'])
                                         
                                         if response.get('model'):
-                                            ui.label(f"{_t('ai_model')}: {response['model']}").classes('text-xs mt-2').style(f'color: {c.text_secondary};')
+                                            ui.label(f"{_t('ai_model')}: {response['model']}").classes('text-xs mt-2').style(styles['muted'])
                                 
                                 ui.notify(_t('ai_success'), type='positive')
                                 
@@ -161,38 +214,25 @@ def main():
                                 ai_loading.clear()
                                 
                                 with ai_result_container:
-                                    with ui.element('div').style(
-                                        f'background-color: {c.bg_primary}; '
-                                        f'border: 1px solid {c.danger}; '
-                                        f'border-radius: 0.5rem; '
-                                        f'padding: 1rem;'
-                                    ):
+                                    with ui.element('div').style(styles['result_error']):
                                         with ui.row().classes('items-center gap-2 mb-2'):
-                                            ui.icon('error').style(f'color: {c.danger};')
-                                            ui.label(_t('ai_failed')).classes('font-semibold').style(f'color: {c.text_primary};')
+                                            ui.icon('error').style(styles['danger'])
+                                            ui.label(_t('ai_failed')).classes('font-semibold').style(styles['text'])
                                         
-                                        ui.label(str(e)).style(f'color: {c.danger};')
+                                        ui.label(str(e)).style(styles['danger'])
                                 
                                 ui.notify(f"{_t('ai_failed')}: {e}", type='negative')
                         
-                        ui.button(_t('call_ai'), on_click=call_ai, icon='send').style(
-                            f'background-color: {c.primary}; '
-                            f'color: white;'
-                        )
+                        ui.button(_t('call_ai'), on_click=call_ai, icon='send').style(styles['button_primary'])
                 
                 # === Right Column: Tool Call Demo ===
                 with ui.column().classes('flex-1 min-w-80'):
-                    with ui.card().classes('w-full').style(
-                        f'background-color: {c.bg_secondary}; '
-                        f'border: 1px solid {c.border}; '
-                        f'border-radius: 0.5rem; '
-                        f'padding: 1.5rem;'
-                    ):
+                    with ui.card().classes('w-full').style(styles['panel']):
                         with ui.row().classes('items-center gap-2 mb-4'):
-                            ui.icon('schedule', size='1.5rem').style(f'color: {c.warning};')
-                            ui.label(_t('tool_demo')).classes('text-lg font-semibold').style(f'color: {c.text_primary};')
+                            ui.icon('schedule', size='1.5rem').style(styles['icon_warning'])
+                            ui.label(_t('tool_demo')).classes('text-lg font-semibold').style(styles['text'])
                         
-                        ui.label(_t('tool_desc')).classes('text-sm mb-4').style(f'color: {c.text_secondary};')
+                        ui.label(_t('tool_desc')).classes('text-sm mb-4').style(styles['muted'])
                         
                         tool_result_container = ui.element('div').classes('w-full')
                         tool_loading = ui.element('div').classes('w-full')
@@ -203,33 +243,21 @@ def main():
                             
                             with tool_loading:
                                 with ui.row().classes('items-center gap-2'):
-                                    ui.spinner(size='sm').style(f'color: {c.primary};')
-                                    ui.label(_t('tool_loading')).style(f'color: {c.text_secondary};')
+                                    ui.spinner(size='sm').style(styles['icon_primary'])
+                                    ui.label(_t('tool_loading')).style(styles['muted'])
                             
                             try:
-                                # Call Tool via SDK (calling a built-in tool or another plugin's tool)
-                                # For demo, we assume there is a 'get_current_time' tool or we just mock it if not available
-                                # Let's try to call 'search' if available, or just list tools
-                                
-                                # Actually, let's call a safe tool. Assuming 'time' tool exists or we use 'search'.
-                                # For this demo, let's try to list tools first.
-                                
-                                # Mocking a tool call for visual demo if real one fails
-                                await asyncio.sleep(1)
-                                result = {"time": datetime.now().isoformat(), "timezone": "UTC"}
+                                # Mocked tool call for the visual demo; the result is computed locally,
+                                # so there is nothing to wait for.
+                                result = {"time": fast_iso_now(), "timezone": "UTC"}
                                 
                                 tool_loading.clear()
                                 
                                 with tool_result_container:
-                                    with ui.element('div').style(
-                                        f'background-color: {c.bg_primary}; '
-                                        f'border: 1px solid {c.success}; '
-                                        f'border-radius: 0.5rem; '
-                                        f'padding: 1rem;'
-                                    ):
+                                    with ui.element('div').style(styles['result_success']):
                                         with ui.row().classes('items-center gap-2 mb-2'):
-                                            ui.icon('check_circle').style(f'color: {c.success};')
-                                            ui.label(_t('tool_result')).classes('font-semibold').style(f'color: {c.text_primary};')
+                                            ui.icon('check_circle').style(styles['success'])
+                                            ui.label(_t('tool_result')).classes('font-semibold').style(styles['text'])
                                         
                                         ui.json_editor({'content': {'json': result}}, mode='view').classes('w-full')
                                 
@@ -239,13 +267,10 @@ def main():
                                 tool_loading.clear()
                                 ui.notify(f"{_t('ai_failed')}: {e}", type='negative')
 
-                        ui.button(_t('call_tool'), on_click=call_datetime_tool, icon='build').style(
-                            f'background-color: {c.warning}; '
-                            f'color: white;'
-                        )
+                        ui.button(_t('call_tool'), on_click=call_datetime_tool, icon='build').style(styles['button_warning'])
                         
                         # Divider
-                        ui.element('hr').classes('my-4').style(f'border-top: 1px solid {c.border};')
+                        ui.element('hr').classes('my-4').style(styles['divider'])
                         
                         # List tools button
                         tools_list_container = ui.element('div').classes('w-full')
@@ -254,34 +279,51 @@ def main():
                             tools_list_container.clear()
                             
                             try:
-                                tools = await host.tools.list()
+                                tools = await host_tools.get()
                                 
                                 with tools_list_container:
-                                    ui.label(f'发现 {len(tools)} 个可用工具:').classes('text-sm mb-2').style(f'color: {c.text_secondary};')
-                                    
-                                    with ui.scroll_area().classes('w-full').style(f'max-height: 200px;'):
-                                        for tool in tools[:10]:  # Show first 10
-                                            with ui.row().classes('items-center gap-2 py-1'):
-                                                ui.icon(tool.get('icon', '📦')).style(f'font-size: 1rem;')
-                                                ui.label(tool['name']).classes('text-sm font-mono').style(f'color: {c.text_primary};')
-                                        
-                                        if len(tools) > 10:
-                                            ui.label(f'... 还有 {len(tools) - 10} 个工具').classes('text-xs').style(f'color: {c.text_secondary};')
+                                    ui.label(f'发现 {len(tools)} 个可用工具:').classes('text-sm mb-2').style(styles['muted'])
+
+                                    rows = []
+                                    window_start = None
+
+                                    def render_window(first_visible: int):
+                                        nonlocal window_start
+                                        start = max(0, min(first_visible - TOOL_ROW_BUFFER, len(tools) - len(rows)))
+                                        if start == window_start:
+                                            return
+                                        window_start = start
+                                        window.style(f'top: {start * TOOL_ROW_PX}px;')
+                                        for offset, (icon, label) in enumerate(rows):
+                                            tool = tools[start + offset]
+                                            icon.set_name(tool.get('icon', '📦'))
+                                            label.set_text(tool['name'])
+
+                                    viewport_px = min(TOOL_VIEWPORT_PX, len(tools) * TOOL_ROW_PX)
+                                    with ui.scroll_area(
+                                        on_scroll=lambda e: render_window(int(e.vertical_position // TOOL_ROW_PX)),
+                                    ).classes('w-full').style(f'height: {viewport_px}px;'):
+                                        with ui.element('div').style(f'position: relative; height: {len(tools) * TOOL_ROW_PX}px;'):
+                                            window = ui.element('div').style('position: absolute; left: 0; right: 0; top: 0;')
+                                            with window:
+                                                for _ in range(min(TOOL_ROW_POOL, len(tools))):
+                                                    with ui.row().classes('items-center gap-2 no-wrap').style(f'height: {TOOL_ROW_PX}px;'):
+                                                        icon = ui.icon('📦').style('font-size: 1rem;')
+                                                        label = ui.label('').classes('text-sm font-mono').style(styles['text'])
+                                                    rows.append((icon, label))
+                                    render_window(0)
                                 
                                 ui.notify(f'列出 {len(tools)} 个工具', type='info')
                                 
                             except Exception as e:
                                 with tools_list_container:
-                                    ui.label(f'获取工具列表失败: {e}').style(f'color: {c.danger};')
+                                    ui.label(f'获取工具列表失败: {e}').style(styles['danger'])
                         
-                        ui.button('列出可用工具', on_click=list_tools, icon='list').props('outline').style(
-                            f'color: {c.text_primary}; '
-                            f'border-color: {c.border};'
-                        )
+                        ui.button('列出可用工具', on_click=list_tools, icon='list').props('outline').style(styles['button_outline'])
             
             # Footer
             with ui.row().classes('w-full justify-center mt-8'):
-                ui.label('Powered by DawnChat SDK').classes('text-sm').style(f'color: {c.text_disabled};')
+                ui.label('Powered by DawnChat SDK').classes('text-sm').style(styles['footer'])
 
     # Register startup callback to signal readiness to PluginManager
     def on_startup():
@@ -297,7 +339,8 @@ def main():
         favicon="🚀",
         show=False,
         reload=False,
-        dark=True
+        dark=True,
+        **uvicorn_loop_options(),
     )
 
 
@@ -1,59 +1,130 @@
 import argparse
 import asyncio
-import json
+import hashlib
 import os
-import sys
+import stat
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any, Optional
 
-from fastapi import APIRouter, FastAPI
-from fastapi.responses import HTMLResponse
+import anyio
+import orjson
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic.dataclasses import dataclass
+from starlette.types import Scope
 
-from dawnchat_sdk import host, report_task_progress
+from dawnchat_sdk import CoalescedFetch, LLMResponseCache, host, report_task_progress, uvicorn_loop_options
 from mcp import build_mcp_router
 
 
-class ChatRequest(BaseModel):
+_INDEX_CACHE_CONTROL = "public, max-age=60"
+# Vite emits content-hashed file names under assets/, so they never change in place.
+_HASHED_ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_PRECOMPRESSED_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+_TOOLS_LIST_TTL = 5.0
+_PROGRESS_REPORT_INTERVAL = 0.25
+# Readiness line PluginManager waits for on stderr
+_READY_LINE = b'{"status": "ready"}\n'
+
+
+_REQUEST_CONFIG = ConfigDict(extra="ignore")
+
+
+@dataclass(config=_REQUEST_CONFIG)
+class ChatRequest:
     prompt: str
     temperature: float = 0.7
 
 
-class KVSetRequest(BaseModel):
+@dataclass(config=_REQUEST_CONFIG)
+class KVSetRequest:
     key: str
     value: Any
 
 
-class ToolCallRequest(BaseModel):
+@dataclass(config=_REQUEST_CONFIG)
+class ToolCallRequest:
     name: str
     arguments: dict[str, Any] | None = None
     timeout: float | None = None
 
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class _PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that prefers build-time .br/.gz siblings and caches hashed assets."""
+
+    async def get_response(self, path: str, scope: Scope):
+        response = None
+        headers = dict(scope["headers"])
+        accepted = _accepted_encodings(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if accepted and not path.endswith((".br", ".gz")):
+            for encoding, suffix in _PRECOMPRESSED_SUFFIXES:
+                if encoding not in accepted:
+                    continue
+                full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+                if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+                    # FileResponse guesses the media type of the original file from "x.js.br".
+                    response = self.file_response(full_path, stat_result, scope)
+                    response.headers["Content-Encoding"] = encoding
+                    break
+        if response is None:
+            response = await super().get_response(path, scope)
+        response.headers["Vary"] = "Accept-Encoding"
+        if path.startswith("assets/") and response.status_code in (200, 206, 304):
+            response.headers["Cache-Control"] = _HASHED_ASSET_CACHE_CONTROL
+        return response
+
+
 def load_manifest(base_dir: Path) -> dict:
-    manifest_path = base_dir / "manifest.json"
-    if not manifest_path.exists():
-        return {}
     try:
-        return json.loads(manifest_path.read_text(encoding="utf-8"))
-    except Exception:
+        return orjson.loads((base_dir / "manifest.json").read_bytes())
+    except (OSError, orjson.JSONDecodeError):
         return {}
 
 
+class _ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 def create_app(base_dir: Path) -> FastAPI:
     @asynccontextmanager
     async def lifespan(_: FastAPI):
-        print(json.dumps({"status": "ready"}), file=sys.stderr, flush=True)
+        os.write(2, _READY_LINE)
         yield
 
-    app = FastAPI(lifespan=lifespan)
+    app = FastAPI(lifespan=lifespan, default_response_class=_ORJSONResponse)
     web_dir = base_dir / "web"
     manifest = load_manifest(base_dir)
     manifest_tools = manifest.get("capabilities", {}).get("tools", [])
     plugin_id = os.environ.get("DAWNCHAT_PLUGIN_ID", "")
     host_port = os.environ.get("DAWNCHAT_HOST_PORT", "")
     base_path = os.environ.get("DAWNCHAT_PLUGIN_BASE_PATH", "").strip().rstrip("/")
+    asset_prefix = f"{base_path}/assets/" if base_path else None
+    # The environment is read once, so /api/info can serve pre-encoded bytes.
+    info_body = orjson.dumps({"status": "ok", "plugin_id": plugin_id, "host_port": host_port})
+    ai_cache = LLMResponseCache()
+    # Concurrent /api/sdk/tools requests share one host.tools.list() call,
+    # and its result is reused for a few seconds.
+    host_tools = CoalescedFetch(lambda: host.tools.list(), ttl=_TOOLS_LIST_TTL)
 
     async def _tool_hello_world(arguments: dict) -> dict:
         name = str(arguments.get("name", "")).strip() or "World"
@@ -68,13 +139,21 @@ def create_app(base_dir: Path) -> FastAPI:
             delay = 2.0
         delay = max(0.0, min(delay, 30.0))
         await report_task_progress(0.1, "preparing async greeting")
-        steps = 5
-        for idx in range(steps):
-            await asyncio.sleep(delay / steps if steps > 0 else delay)
-            await report_task_progress(
-                0.1 + 0.8 * ((idx + 1) / steps),
-                f"processing {idx + 1}/{steps}",
-            )
+        # Report by elapsed time rather than per step, so short delays cost one
+        # host update and long ones at most one every _PROGRESS_REPORT_INTERVAL.
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + delay
+        next_report = started + _PROGRESS_REPORT_INTERVAL
+        while (now := loop.time()) < deadline:
+            await asyncio.sleep(min(deadline, next_report) - now)
+            now = loop.time()
+            if next_report <= now < deadline:
+                fraction = (now - started) / delay
+                await asyncio.shield(
+                    report_task_progress(0.1 + 0.8 * fraction, f"processing {int(fraction * 100)}%")
+                )
+                next_report = now + _PROGRESS_REPORT_INTERVAL
         return {"greeting": f"Hello async, {name}!", "delay_seconds": delay}
 
     tool_handlers = {
@@ -90,22 +169,21 @@ def create_app(base_dir: Path) -> FastAPI:
 
     @api_router.get("/info")
     async def info():
-        return {
-            "status": "ok",
-            "plugin_id": plugin_id,
-            "host_port": host_port,
-        }
+        return Response(content=info_body, media_type="application/json")
 
     @api_router.post("/sdk/ai")
     async def sdk_ai(request: ChatRequest):
         try:
-            response = await host.ai.chat(
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant."},
-                    {"role": "user", "content": request.prompt},
-                ],
-                temperature=request.temperature,
-            )
+            messages = [
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": request.prompt},
+            ]
+            cache_key = ai_cache.cache_key(messages, temperature=request.temperature)
+            response = ai_cache.get(cache_key) if cache_key else None
+            if response is None:
+                response = await host.ai.chat(messages=messages, temperature=request.temperature)
+                if cache_key:
+                    ai_cache.set(cache_key, response)
             return {
                 "status": "ok",
                 "content": response.get("content", ""),
@@ -115,10 +193,14 @@ def create_app(base_dir: Path) -> FastAPI:
         except Exception as exc:
             return {"status": "error", "message": str(exc)}
 
+    @api_router.get("/sdk/cache/stats")
+    async def sdk_cache_stats():
+        return {"status": "ok", "ai": ai_cache.stats}
+
     @api_router.get("/sdk/tools")
     async def sdk_tools(limit: Optional[int] = 100):
         try:
-            tools = await host.tools.list()
+            tools = await host_tools.get()
             if limit is not None:
                 tools = tools[: max(1, limit)]
             return {"status": "ok", "tools": tools}
@@ -164,19 +246,26 @@ def create_app(base_dir: Path) -> FastAPI:
     def _render_index_html() -> str:
         html_path = web_dir / "index.html"
         html = html_path.read_text(encoding="utf-8")
-        if base_path:
-            asset_prefix = f"{base_path}/assets/"
+        if asset_prefix:
             html = html.replace('="/assets/', f'="{asset_prefix}')
             html = html.replace("='/assets/", f"='{asset_prefix}")
         return html
 
+    index_html = _render_index_html().encode("utf-8")
+    index_headers = {
+        "ETag": f'"{hashlib.blake2b(index_html, digest_size=8).hexdigest()}"',
+        "Cache-Control": _INDEX_CACHE_CONTROL,
+    }
+
     @app.get("/")
-    async def root():
-        return HTMLResponse(_render_index_html())
+    async def root(request: Request):
+        if request.headers.get("if-none-match") == index_headers["ETag"]:
+            return Response(status_code=304, headers=index_headers)
+        return Response(content=index_html, media_type="text/html", headers=index_headers)
 
     app.include_router(api_router)
     app.include_router(mcp_router)
-    app.mount("/", StaticFiles(directory=str(web_dir), html=True), name="web")
+    app.mount("/", _PrecompressedStaticFiles(directory=str(web_dir), html=True), name="web")
     return app
 
 def main():
@@ -193,8 +282,8 @@ def main():
     app = create_app(base_dir)
     
     import uvicorn
-    
-    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="info", **uvicorn_loop_options())
 
 if __name__ in {"__main__", "__mp_main__"}:
     main()
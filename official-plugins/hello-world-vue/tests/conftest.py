@@ -0,0 +1,72 @@
+import asyncio
+import importlib.util
+from pathlib import Path
+import sys
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+TESTS_DIR = Path(__file__).resolve().parent
+SRC_DIR = TESTS_DIR.parent / "src"
+SDK_DIR = TESTS_DIR.parents[2] / "sdk"
+
+# Put the SDK and plugin sources on sys.path once, when conftest is imported,
+# and drop duplicate entries so every later import scans a shorter path list.
+for _path in (str(SDK_DIR), str(SRC_DIR)):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+sys.path[:] = list(dict.fromkeys(sys.path))
+
+MCP_TOOLS = [
+    {"name": "hello_world", "description": "say hi", "inputSchema": {"type": "object", "properties": {}}},
+    {"name": "hello_world_async", "description": "say hi async", "inputSchema": {"type": "object", "properties": {}}},
+]
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+
+def pytest_asyncio_loop_factories(config, item):
+    # Match the loop the plugin itself runs on (see main()).
+    if uvloop is not None:
+        return {"uvloop": uvloop.new_event_loop}
+    return {"asyncio": asyncio.new_event_loop}
+
+
+def _load_src_module(name: str, filename: str):
+    spec = importlib.util.spec_from_file_location(name, SRC_DIR / filename)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def mcp_module():
+    return _load_src_module("hello_world_mcp", "mcp.py")
+
+
+@pytest.fixture(scope="session")
+def main_module():
+    return _load_src_module("hello_world_vue_main", "main.py")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def _shared_mcp_client(mcp_module):
+    # One router, app and client per test module; tests install handlers by name.
+    handlers: dict = {}
+    app = FastAPI()
+    app.include_router(mcp_module.build_mcp_router(MCP_TOOLS, handlers))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client, handlers
+
+
+@pytest.fixture
+def mcp_client(_shared_mcp_client):
+    client, handlers = _shared_mcp_client
+    handlers.clear()
+    return client, handlers
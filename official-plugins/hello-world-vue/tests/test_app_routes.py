@@ -0,0 +1,131 @@
+import asyncio
+import gzip
+from pathlib import Path
+from types import SimpleNamespace
+
+from httpx import ASGITransport, AsyncClient
+
+PLUGIN_DIR = Path(__file__).resolve().parent.parent
+
+
+async def test_index_is_served_with_etag_and_304(main_module, tmp_path: Path, monkeypatch):
+    web_dir = tmp_path / "web"
+    web_dir.mkdir()
+    (web_dir / "index.html").write_text(
+        '<script src="/assets/app.js"></script><link href=\'/assets/app.css\'>',
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("DAWNCHAT_PLUGIN_BASE_PATH", "/plugins/hello/")
+    app = main_module.create_app(tmp_path)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/html")
+        assert resp.text == (
+            '<script src="/plugins/hello/assets/app.js"></script>'
+            "<link href='/plugins/hello/assets/app.css'>"
+        )
+        etag = resp.headers["etag"]
+
+        # The shell is rendered once; later edits on disk are not re-read per request.
+        (web_dir / "index.html").write_text("changed", encoding="utf-8")
+        cached_resp = await client.get("/", headers={"If-None-Match": etag})
+        assert cached_resp.status_code == 304
+        assert cached_resp.headers["etag"] == etag
+        assert cached_resp.content == b""
+
+
+async def test_concurrent_tool_listings_share_one_host_call(main_module, tmp_path: Path, monkeypatch):
+    (tmp_path / "web").mkdir()
+    (tmp_path / "web" / "index.html").write_text("<html></html>", encoding="utf-8")
+    calls = 0
+
+    async def list_tools():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [{"name": "a"}, {"name": "b"}]
+
+    monkeypatch.setattr(main_module, "host", SimpleNamespace(tools=SimpleNamespace(list=list_tools)))
+    app = main_module.create_app(tmp_path)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        responses = await asyncio.gather(*(client.get("/api/sdk/tools") for _ in range(3)))
+        assert [resp.json()["tools"] for resp in responses] == [[{"name": "a"}, {"name": "b"}]] * 3
+        limited = await client.get("/api/sdk/tools", params={"limit": 1})
+        assert limited.json()["tools"] == [{"name": "a"}]
+
+    assert calls == 1
+
+
+async def test_short_async_greeting_reports_progress_once(main_module, monkeypatch):
+    reports: list[tuple[float, str]] = []
+
+    async def record_progress(progress: float, message: str = "") -> bool:
+        reports.append((progress, message))
+        return True
+
+    monkeypatch.setattr(main_module, "report_task_progress", record_progress)
+    app = main_module.create_app(PLUGIN_DIR)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        submit_resp = await client.post(
+            "/mcp",
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "tools/submit",
+                "params": {"name": "hello_world_async", "arguments": {"name": "Dawn", "delay_seconds": 0.05}},
+            },
+        )
+        task_id = submit_resp.json()["result"]["task_id"]
+        wait_resp = await client.post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "id": 2, "method": "tasks/wait", "params": {"task_id": task_id, "timeout": 2.0}},
+        )
+        assert wait_resp.json()["result"]["status"] == "completed"
+
+    assert reports == [(0.1, "preparing async greeting")]
+
+
+async def test_request_bodies_validate_and_ignore_extra_fields(main_module, monkeypatch):
+    saved: dict[str, object] = {}
+
+    async def kv_set(key, value):
+        saved[key] = value
+        return True
+
+    monkeypatch.setattr(main_module, "host", SimpleNamespace(storage=SimpleNamespace(kv=SimpleNamespace(set=kv_set))))
+    app = main_module.create_app(PLUGIN_DIR)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/api/sdk/kv", json={"key": "greeting", "value": {"text": "hi"}, "extra": 1})
+        assert resp.json() == {"status": "ok", "saved": True}
+        invalid = await client.post("/api/sdk/kv", json={"value": 1})
+        assert invalid.status_code == 422
+
+    assert saved == {"greeting": {"text": "hi"}}
+
+
+async def test_static_assets_prefer_precompressed_siblings(main_module, tmp_path: Path):
+    assets_dir = tmp_path / "web" / "assets"
+    assets_dir.mkdir(parents=True)
+    (tmp_path / "web" / "index.html").write_text("<html></html>", encoding="utf-8")
+    source = b"console.log('hello');" * 20
+    (assets_dir / "app-abc123.js").write_bytes(source)
+    (assets_dir / "app-abc123.js.gz").write_bytes(gzip.compress(source))
+    app = main_module.create_app(tmp_path)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/assets/app-abc123.js", headers={"Accept-Encoding": "br;q=0, gzip"})
+        assert resp.status_code == 200
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.headers["content-type"].startswith("text/javascript")
+        assert resp.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert resp.content == source
+
+        plain = await client.get("/assets/app-abc123.js", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.content == source
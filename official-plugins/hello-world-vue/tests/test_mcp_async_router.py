@@ -1,122 +1,93 @@
-import importlib.util
 import asyncio
 import json
-from pathlib import Path
-import sys
 
 import pytest
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 
+from dawnchat_sdk.mcp_router import TaskCallbackDispatcher
 
-def _load_mcp_module():
-    repo_root = Path(__file__).resolve().parents[3]
-    sdk_path = repo_root / "sdk"
-    if str(sdk_path) not in sys.path:
-        sys.path.insert(0, str(sdk_path))
-    module_path = Path(__file__).resolve().parent.parent / "src" / "mcp.py"
-    spec = importlib.util.spec_from_file_location("hello_world_mcp", module_path)
-    assert spec is not None and spec.loader is not None
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
 
-@pytest.mark.asyncio
-async def test_tools_submit_and_tasks_get():
-    module = _load_mcp_module()
-    manifest_tools = [
-        {"name": "hello_world", "description": "say hi", "inputSchema": {"type": "object", "properties": {}}}
-    ]
-
+async def test_tools_submit_and_tasks_get(mcp_client):
     async def handler(arguments):
         return {"greeting": f"Hello, {arguments.get('name', 'World')}!"}
 
-    router = module.build_mcp_router(manifest_tools, {"hello_world": handler})
-    app = FastAPI()
-    app.include_router(router)
+    client, handlers = mcp_client
+    handlers["hello_world"] = handler
 
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        submit_resp = await client.post(
-            "/mcp",
-            json={
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/submit",
-                "params": {"name": "hello_world", "arguments": {"name": "Dawn"}},
-            },
-        )
-        submit_payload = submit_resp.json()["result"]
-        task_id = submit_payload["task_id"]
-        assert submit_payload["status"] == "accepted"
-
-        for _ in range(20):
-            status_resp = await client.post(
-                "/mcp",
-                json={"jsonrpc": "2.0", "id": 2, "method": "tasks/get", "params": {"task_id": task_id}},
-            )
-            status_payload = status_resp.json()["result"]
-            if status_payload["status"] == "completed":
-                result_text = status_payload["result"]["content"][0]["text"]
-                result_data = json.loads(result_text)
-                assert result_data["data"]["greeting"] == "Hello, Dawn!"
-                return
-            await asyncio.sleep(0.02)
-
-        raise AssertionError("task did not complete in time")
-
-
-@pytest.mark.asyncio
-async def test_async_task_reports_progress():
-    module = _load_mcp_module()
+    submit_resp = await client.post(
+        "/mcp",
+        json={
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/submit",
+            "params": {"name": "hello_world", "arguments": {"name": "Dawn"}},
+        },
+    )
+    submit_payload = submit_resp.json()["result"]
+    task_id = submit_payload["task_id"]
+    assert submit_payload["status"] == "accepted"
+
+    status_resp = await client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 2, "method": "tasks/get", "params": {"task_id": task_id, "wait_ms": 2000}},
+    )
+    status_payload = status_resp.json()["result"]
+    assert status_payload["status"] == "completed"
+    result_text = status_payload["result"]["content"][0]["text"]
+    result_data = json.loads(result_text)
+    assert result_data["data"]["greeting"] == "Hello, Dawn!"
+
+
+async def test_async_task_reports_progress(mcp_client):
     from dawnchat_sdk.mcp_router import report_task_progress
 
-    manifest_tools = [
-        {"name": "hello_world_async", "description": "say hi async", "inputSchema": {"type": "object", "properties": {}}}
-    ]
+    half_way = asyncio.Event()
+    release = asyncio.Event()
 
     async def handler(arguments):
         await report_task_progress(0.4, "half way")
-        await asyncio.sleep(0.05)
+        half_way.set()
+        await release.wait()
         await report_task_progress(0.8, "almost done")
         return {"greeting": f"Hello async, {arguments.get('name', 'World')}!"}
 
-    router = module.build_mcp_router(manifest_tools, {"hello_world_async": handler})
-    app = FastAPI()
-    app.include_router(router)
+    client, handlers = mcp_client
+    handlers["hello_world_async"] = handler
 
-    saw_progress = False
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        submit_resp = await client.post(
-            "/mcp",
-            json={
-                "jsonrpc": "2.0",
-                "id": 11,
-                "method": "tools/submit",
-                "params": {"name": "hello_world_async", "arguments": {"name": "Dawn"}},
-            },
-        )
-        task_id = submit_resp.json()["result"]["task_id"]
+    submit_resp = await client.post(
+        "/mcp",
+        json={
+            "jsonrpc": "2.0",
+            "id": 11,
+            "method": "tools/submit",
+            "params": {"name": "hello_world_async", "arguments": {"name": "Dawn"}},
+        },
+    )
+    task_id = submit_resp.json()["result"]["task_id"]
+
+    await asyncio.wait_for(half_way.wait(), timeout=2.0)
+    status_resp = await client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 12, "method": "tasks/get", "params": {"task_id": task_id}},
+    )
+    payload = status_resp.json()["result"]
+    assert payload["status"] == "running"
+    assert payload["progress"] == 0.4
+
+    release.set()
+    status_resp = await client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 13, "method": "tasks/wait", "params": {"task_id": task_id, "timeout": 2.0}},
+    )
+    payload = status_resp.json()["result"]
+    assert payload["status"] == "completed"
+    assert payload["progress"] == 1.0
 
-        for _ in range(40):
-            status_resp = await client.post(
-                "/mcp",
-                json={"jsonrpc": "2.0", "id": 12, "method": "tasks/get", "params": {"task_id": task_id}},
-            )
-            payload = status_resp.json()["result"]
-            if payload["status"] == "running" and payload.get("progress", 0) >= 0.4:
-                saw_progress = True
-            if payload["status"] == "completed":
-                assert payload.get("progress") == 1.0
-                break
-            await asyncio.sleep(0.01)
-
-    assert saw_progress is True
-
-
-@pytest.mark.asyncio
-async def test_task_callbacks_do_not_break_async_task():
-    module = _load_mcp_module()
+
+async def test_task_callbacks_do_not_break_async_task(mcp_module):
     events: list[dict] = []
 
     manifest_tools = [
@@ -134,11 +105,13 @@ async def test_task_callbacks_do_not_break_async_task():
     def event_callback(event: dict):
         events.append(event)
 
-    router = module.build_mcp_router(
+    dispatcher = TaskCallbackDispatcher()
+    router = mcp_module.build_mcp_router(
         manifest_tools,
         {"hello_world_async": handler},
         on_task_progress=broken_progress_callback,
         on_task_event=event_callback,
+        callback_dispatcher=dispatcher,
     )
     app = FastAPI()
     app.include_router(router)
@@ -155,19 +128,232 @@ async def test_task_callbacks_do_not_break_async_task():
         )
         task_id = submit_resp.json()["result"]["task_id"]
 
-        for _ in range(40):
-            status_resp = await client.post(
-                "/mcp",
-                json={"jsonrpc": "2.0", "id": 22, "method": "tasks/get", "params": {"task_id": task_id}},
-            )
-            payload = status_resp.json()["result"]
-            if payload["status"] == "completed":
-                assert payload["progress"] == 1.0
-                break
-            await asyncio.sleep(0.01)
-        else:
-            raise AssertionError("task did not complete in time")
+        status_resp = await client.post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "id": 22, "method": "tasks/wait", "params": {"task_id": task_id, "timeout": 2.0}},
+        )
+        payload = status_resp.json()["result"]
+        assert payload["status"] == "completed"
+        assert payload["progress"] == 1.0
 
+    # Callbacks run in the background and may still be queued when the task settles.
+    await asyncio.wait_for(dispatcher.join(), timeout=2.0)
     event_names = {item.get("event") for item in events}
     assert "task_started" in event_names
     assert "task_completed" in event_names
+
+
+async def test_tasks_wait_times_out_without_cancelling_task(mcp_client):
+    release = asyncio.Event()
+
+    async def handler(arguments):
+        await release.wait()
+        return {"greeting": "done"}
+
+    client, handlers = mcp_client
+    handlers["hello_world_async"] = handler
+
+    submit_resp = await client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 31, "method": "tools/submit", "params": {"name": "hello_world_async"}},
+    )
+    task_id = submit_resp.json()["result"]["task_id"]
+
+    wait_params = {"task_id": task_id, "timeout": 0.01}
+    timed_out = await client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 32, "method": "tasks/wait", "params": wait_params},
+    )
+    assert timed_out.json()["result"]["status"] == "running"
+
+    release.set()
+    wait_params["timeout"] = 2.0
+    finished = await client.post(
+        "/mcp",
+        json={"jsonrpc": "2.0", "id": 33, "method": "tasks/wait", "params": wait_params},
+    )
+    assert finished.json()["result"]["status"] == "completed"
+
+
+async def test_task_store_evicts_oldest_finished_tasks(mcp_module):
+    release = asyncio.Event()
+    manifest_tools = [
+        {"name": "hello_world", "description": "say hi", "inputSchema": {"type": "object", "properties": {}}},
+        {"name": "hello_world_async", "description": "say hi async", "inputSchema": {"type": "object", "properties": {}}},
+    ]
+
+    async def handler(arguments):
+        return {"greeting": "hi"}
+
+    async def blocking_handler(arguments):
+        await release.wait()
+        return {"greeting": "done"}
+
+    router = mcp_module.build_mcp_router(
+        manifest_tools,
+        {"hello_world": handler, "hello_world_async": blocking_handler},
+        max_tasks=3,
+    )
+    app = FastAPI()
+    app.include_router(router)
+
+    async def submit(client, name):
+        resp = await client.post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "id": 41, "method": "tools/submit", "params": {"name": name}},
+        )
+        return resp.json()["result"]["task_id"]
+
+    async def status(client, task_id):
+        resp = await client.post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "id": 42, "method": "tasks/get", "params": {"task_id": task_id}},
+        )
+        return resp.json()["result"]["status"]
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        running_id = await submit(client, "hello_world_async")
+        finished_ids = []
+        for _ in range(4):
+            finished_ids.append(await submit(client, "hello_world"))
+            await asyncio.sleep(0)
+
+        # The still-running task survives eviction; only the oldest finished ones go.
+        assert await status(client, running_id) == "running"
+        assert [await status(client, task_id) for task_id in finished_ids] == [
+            "not_found",
+            "not_found",
+            "completed",
+            "completed",
+        ]
+
+        release.set()
+        wait_resp = await client.post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "id": 43, "method": "tasks/wait", "params": {"task_id": running_id}},
+        )
+        assert wait_resp.json()["result"]["status"] == "completed"
+
+
+async def test_batch_requests_are_answered_in_order(mcp_client):
+    async def handler(arguments):
+        return {"greeting": f"Hello, {arguments.get('name', 'World')}!"}
+
+    client, handlers = mcp_client
+    handlers["hello_world"] = handler
+
+    resp = await client.post(
+        "/mcp",
+        json=[
+            {"jsonrpc": "2.0", "id": 51, "method": "ping"},
+            {"jsonrpc": "2.0", "id": 52, "method": "tools/call", "params": {"name": "hello_world"}},
+            {"jsonrpc": "2.0", "id": 53, "method": "missing"},
+        ],
+    )
+    payload = resp.json()
+    assert [item["id"] for item in payload] == [51, 52, 53]
+    assert payload[0]["result"] == {"status": "ok"}
+    assert json.loads(payload[1]["result"]["content"][0]["text"])["data"] == {"greeting": "Hello, World!"}
+    assert payload[2]["error"]["code"] == -32601
+
+    empty = await client.post("/mcp", json=[])
+    assert empty.json()["error"]["code"] == -32600
+
+
+async def test_batch_skips_notifications_and_rejects_bad_entries_individually(mcp_client):
+    calls: list[str] = []
+
+    async def handler(arguments):
+        calls.append(arguments.get("name", "World"))
+        return {"greeting": "hi"}
+
+    client, handlers = mcp_client
+    handlers["hello_world"] = handler
+
+    resp = await client.post(
+        "/mcp",
+        json=[
+            {"jsonrpc": "2.0", "method": "tools/call", "params": {"name": "hello_world", "arguments": {"name": "n"}}},
+            {"jsonrpc": "2.0", "id": 71, "method": "ping"},
+            {"jsonrpc": "2.0", "id": 72, "params": {}},
+            "not a request",
+        ],
+    )
+    payload = resp.json()
+    assert [item["id"] for item in payload] == [71, 72, None]
+    assert payload[0]["result"] == {"status": "ok"}
+    assert payload[1]["error"]["code"] == -32600
+    assert payload[2]["error"]["code"] == -32600
+    assert calls == ["n"]
+
+    only_notifications = await client.post("/mcp", json=[{"jsonrpc": "2.0", "method": "ping"}])
+    assert only_notifications.status_code == 204
+    assert only_notifications.content == b""
+
+
+async def test_batch_entry_failure_does_not_drop_other_responses(mcp_client):
+    async def handler(arguments):
+        return {"greeting": "hi"}
+
+    async def broken_handler(arguments):
+        raise RuntimeError("boom")
+
+    client, handlers = mcp_client
+    handlers["hello_world"] = handler
+    handlers["hello_world_async"] = broken_handler
+
+    resp = await client.post(
+        "/mcp",
+        json=[
+            {"jsonrpc": "2.0", "id": 81, "method": "tools/call", "params": {"name": "hello_world"}},
+            {"jsonrpc": "2.0", "id": 82, "method": "tools/call", "params": {"name": "hello_world_async"}},
+        ],
+    )
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert [item["id"] for item in payload] == [81, 82]
+    assert json.loads(payload[0]["result"]["content"][0]["text"])["data"] == {"greeting": "hi"}
+    assert payload[1]["error"]["code"] == -32603
+
+
+async def test_slow_task_callbacks_run_in_order_without_blocking_task(mcp_module):
+    release = asyncio.Event()
+    all_seen = asyncio.Event()
+    seen: list[float] = []
+
+    async def slow_progress_callback(task_id: str, progress: float, message: str):
+        await release.wait()
+        seen.append(progress)
+        if progress == 1.0:
+            all_seen.set()
+
+    async def handler(arguments):
+        from dawnchat_sdk.mcp_router import report_task_progress
+
+        await report_task_progress(0.5, "half way")
+        return {"greeting": "done"}
+
+    router = mcp_module.build_mcp_router(
+        [{"name": "hello_world", "description": "say hi", "inputSchema": {"type": "object", "properties": {}}}],
+        {"hello_world": handler},
+        on_task_progress=slow_progress_callback,
+    )
+    app = FastAPI()
+    app.include_router(router)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        submit_resp = await client.post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "id": 61, "method": "tools/submit", "params": {"name": "hello_world"}},
+        )
+        task_id = submit_resp.json()["result"]["task_id"]
+        status_resp = await client.post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "id": 62, "method": "tasks/wait", "params": {"task_id": task_id, "timeout": 2.0}},
+        )
+        assert status_resp.json()["result"]["status"] == "completed"
+        assert seen == []
+
+        release.set()
+        await asyncio.wait_for(all_seen.wait(), timeout=2.0)
+        assert seen == [0.05, 0.5, 1.0]
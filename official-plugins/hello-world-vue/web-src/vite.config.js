@@ -1,12 +1,37 @@
 import { defineConfig } from 'vite'
 import vue from '@vitejs/plugin-vue'
 import { resolve } from 'path'
+import { readdirSync, readFileSync, writeFileSync } from 'fs'
+import { brotliCompressSync, constants, gzipSync } from 'zlib'
+
+const outDir = resolve(__dirname, '../web')
+
+// Write .br/.gz siblings next to the built text assets so the FastAPI static
+// handler can serve them without compressing on every request.
+function precompress() {
+  return {
+    name: 'precompress-assets',
+    apply: 'build',
+    closeBundle() {
+      const assetsDir = resolve(outDir, 'assets')
+      for (const name of readdirSync(assetsDir)) {
+        if (!/\.(js|css|svg|json)$/.test(name)) continue
+        const file = resolve(assetsDir, name)
+        const source = readFileSync(file)
+        writeFileSync(`${file}.br`, brotliCompressSync(source, {
+          params: { [constants.BROTLI_PARAM_QUALITY]: 11 }
+        }))
+        writeFileSync(`${file}.gz`, gzipSync(source, { level: 9 }))
+      }
+    }
+  }
+}
 
 export default defineConfig({
-  plugins: [vue()],
+  plugins: [vue(), precompress()],
   base: '/',
   build: {
-    outDir: resolve(__dirname, '../web'),
+    outDir,
     emptyOutDir: true,
     rollupOptions: {
       output: {
@@ -7,32 +7,41 @@ A simple Gradio interface demonstrating the DawnChat Plugin Platform.
 import gradio as gr
 import gradio.themes as gr_themes
 
+GREETING_TEMPLATES = {
+    "friendly": "Hello, {name}! 👋 Welcome to DawnChat Plugin Platform!",
+    "formal": "Good day, {name}. It is a pleasure to meet you.",
+    "casual": "Hey {name}! What's up? 🎉",
+    "enthusiastic": "WOW! {name}! SO GREAT TO MEET YOU! 🚀🎊✨",
+}
+
+
+def greeting_template(greeting_style: str) -> str:
+    """Return the template for a greeting style, falling back to friendly."""
+    return GREETING_TEMPLATES.get(greeting_style) or GREETING_TEMPLATES["friendly"]
+
+
+def format_greeting(name: str, template: str) -> str:
+    """Fill a greeting template with the given name."""
+    if not name or name.isspace():
+        return "👋 Please enter your name!"
+    return template.format(name=name)
+
 
 def greet(name: str, greeting_style: str = "friendly") -> str:
     """Generate a greeting message based on the name and style."""
-    if not name.strip():
-        return "👋 Please enter your name!"
-    
-    greetings = {
-        "friendly": f"Hello, {name}! 👋 Welcome to DawnChat Plugin Platform!",
-        "formal": f"Good day, {name}. It is a pleasure to meet you.",
-        "casual": f"Hey {name}! What's up? 🎉",
-        "enthusiastic": f"WOW! {name}! SO GREAT TO MEET YOU! 🚀🎊✨",
-    }
-    
-    return greetings.get(greeting_style, greetings["friendly"])
+    return format_greeting(name, greeting_template(greeting_style))
 
 
 def reverse_text(text: str) -> str:
     """Reverse the input text."""
-    if not text.strip():
+    if not text or text.isspace():
         return "Please enter some text to reverse!"
     return text[::-1]
 
 
 def count_stats(text: str) -> str:
     """Count characters, words, and lines in the text."""
-    if not text.strip():
+    if not text or text.isspace():
         return "Please enter some text to analyze!"
     
     char_count = len(text)
@@ -73,12 +82,21 @@ def create_app() -> gr.Blocks:
                         scale=2,
                     )
                     style_dropdown = gr.Dropdown(
-                        choices=["friendly", "formal", "casual", "enthusiastic"],
+                        choices=list(GREETING_TEMPLATES),
                         value="friendly",
                         label="Greeting Style",
                         scale=1,
                     )
                 
+                # The selected template lives server-side and is only
+                # looked up again when the style changes, not on every click.
+                template_state = gr.State(greeting_template("friendly"))
+                style_dropdown.change(
+                    fn=greeting_template,
+                    inputs=style_dropdown,
+                    outputs=template_state,
+                )
+                
                 greet_btn = gr.Button("Say Hello! 👋", variant="primary")
                 greeting_output = gr.Textbox(
                     label="Greeting",
@@ -86,8 +104,8 @@ def create_app() -> gr.Blocks:
                 )
                 
                 greet_btn.click(
-                    fn=greet,
-                    inputs=[name_input, style_dropdown],
+                    fn=format_greeting,
+                    inputs=[name_input, template_state],
                     outputs=greeting_output,
                 )
             
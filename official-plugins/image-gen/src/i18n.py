@@ -1,23 +1,53 @@
 import json
+import os
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LOCALE_DIR = Path(__file__).resolve().parent / 'locales'
+
+
+def _flatten(tree: dict, prefix: str = '') -> dict:
+    """Flatten nested locale tables into {"dashboard.title": "...", ...}."""
+    flat = {}
+    for k, value in tree.items():
+        path = f"{prefix}{k}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{path}."))
+        else:
+            flat[path] = str(value)
+    return flat
+
+
 class I18n:
     def __init__(self):
         self.locales = {}
+        self.flat = {}
         self.current_lang = 'zh'  # Default to zh
+        self.current_flat = {}
         self.load_locales()
+        self.current_flat = self.flat.get(self.current_lang, {})
     
     def load_locales(self):
-        locale_dir = Path(__file__).parent / 'locales'
-        if not locale_dir.exists():
+        try:
+            entries = list(os.scandir(LOCALE_DIR))
+        except FileNotFoundError:
             return
             
-        for file in locale_dir.glob('*.json'):
+        for entry in entries:
+            if not entry.name.endswith('.json') or not entry.is_file():
+                continue
+            lang = entry.name[:-5]
             try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    self.locales[file.stem] = json.load(f)
+                with open(entry.path, 'rb') as f:
+                    raw = f.read()
+                self.locales[lang] = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                self.flat[lang] = _flatten(self.locales[lang])
             except Exception as e:
-                print(f"Failed to load locale {file}: {e}")
+                print(f"Failed to load locale {entry.path}: {e}")
                 
     def set_lang(self, lang: str):
         # Support zh-CN -> zh mapping
@@ -27,19 +57,9 @@ class I18n:
             lang = 'en'
             
         self.current_lang = lang if lang in self.locales else 'en'
+        self.current_flat = self.flat.get(self.current_lang, {})
         
     def t(self, key: str) -> str:
-        keys = key.split('.')
-        value = self.locales.get(self.current_lang, {})
-        
-        try:
-            for k in keys:
-                if isinstance(value, dict):
-                    value = value.get(k, key)
-                else:
-                    return key
-            return str(value)
-        except Exception:
-            return key
+        return self.current_flat.get(key, key)
 
 i18n = I18n()
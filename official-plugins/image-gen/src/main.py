@@ -1,7 +1,7 @@
 import argparse
 import sys
-import json
 import logging
+import os
 import asyncio
 from pathlib import Path
 from nicegui import ui, app
@@ -14,6 +14,7 @@ if str(SRC_DIR) not in sys.path:
 from dawnchat_sdk import host
 from dawnchat_sdk.ui import setup_dawnchat_ui, get_theme
 from i18n import i18n
+from ui.components import invalidate_models_cache
 from ui.dashboard import render_dashboard
 from ui.setup import render_setup
 from ui.text_to_image import render_text_to_image
@@ -25,6 +26,9 @@ from ui.upscale import render_upscale
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("image-gen")
 
+# Readiness line PluginManager waits for on stderr
+_READY_LINE = b'{"status": "ready"}\n'
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--host", default="127.0.0.1")
@@ -37,6 +41,9 @@ def main():
             self.current_page = 'dashboard'
             self.has_models = False
             self.checked_status = False
+            # Installed model types for the dashboard, refreshed after render_dashboard's TTL
+            self.caps = None
+            self.caps_ts = 0.0
 
     state = AppState()
 
@@ -49,6 +56,8 @@ def main():
         
         # Container for content
         content = ui.column().classes('w-full min-h-screen p-0')
+        # Only the latest navigation renders; a newer one supersedes an unfinished render
+        render_state = {'task': None}
         
         async def check_status():
             try:
@@ -68,16 +77,21 @@ def main():
                 if not state.has_models:
                     async def retry():
                         state.checked_status = False
+                        state.caps = None
+                        invalidate_models_cache()
                         await render_content()
                     await render_setup(on_check_again=retry)
                     return
 
                 def navigate(page: str):
                     state.current_page = page
-                    asyncio.create_task(render_content())
+                    previous = render_state['task']
+                    if previous is not None and not previous.done():
+                        previous.cancel()
+                    render_state['task'] = asyncio.create_task(render_content())
 
                 if state.current_page == 'dashboard':
-                    await render_dashboard(on_navigate=navigate)
+                    await render_dashboard(on_navigate=navigate, state=state)
                 elif state.current_page == 'text_to_image':
                     await render_text_to_image(on_back=lambda: navigate('dashboard'))
                 elif state.current_page == 'image_to_image':
@@ -91,7 +105,7 @@ def main():
 
     # Startup callback
     def on_startup():
-        print(json.dumps({"status": "ready"}), file=sys.stderr, flush=True)
+        os.write(2, _READY_LINE)
 
     app.on_startup(on_startup)
 
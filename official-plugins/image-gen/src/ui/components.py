@@ -1,5 +1,168 @@
+import asyncio
+import inspect
+import io
+import os
+import shutil
+import tempfile
+import time
+
 from nicegui import ui
+from dawnchat_sdk import host
 from i18n import i18n
+from PIL import Image, ImageOps
+
+# Installed models per task type change rarely; reuse a listing for this long
+MODELS_CACHE_TTL = 60.0
+_models_cache = {}
+
+async def get_installed_models(task_type: str):
+    """List installed models for a task type, cached for MODELS_CACHE_TTL seconds."""
+    cached = _models_cache.get(task_type)
+    if cached is not None and time.monotonic() - cached[0] < MODELS_CACHE_TTL:
+        return cached[1]
+    models = await host.image_gen.list_models(task_type=task_type, installed_only=True)
+    _models_cache[task_type] = (time.monotonic(), models)
+    return models
+
+def invalidate_models_cache():
+    _models_cache.clear()
+
+# Chunk size for copying raw upload bytes into tempfiles
+UPLOAD_COPY_BUFSIZE = 64 * 1024
+
+# EXIF orientation tag; 1 (or absent) means the pixels are already upright
+_EXIF_ORIENTATION = 0x0112
+
+def _upload_is_model_ready(img, max_dim=None):
+    """True if an opened (not yet decoded) upload can be written to disk as-is."""
+    if img.format not in ('PNG', 'JPEG') or img.mode != 'RGB':
+        return False
+    w, h = img.size
+    if w % 2 or h % 2:
+        return False
+    if max_dim and (w > max_dim or h > max_dim):
+        return False
+    return img.getexif().get(_EXIF_ORIENTATION, 1) == 1
+
+def _write_raw_upload(data, suffix):
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as f:
+        shutil.copyfileobj(io.BytesIO(data), f, UPLOAD_COPY_BUFSIZE)
+        return f.name
+
+def _write_upload_sync(data, name, max_dim=None):
+    """Normalize uploaded image bytes into a tempfile and return its path."""
+    try:
+        # The source image and its buffer are closed as soon as a detached RGB
+        # copy exists, so the upload buffer is not kept alive through the encode
+        with io.BytesIO(data) as bio, Image.open(bio) as src:
+            if _upload_is_model_ready(src, max_dim):
+                # Already a standard image: keep the uploaded bytes, no decode/re-encode
+                return _write_raw_upload(data, '.png' if src.format == 'PNG' else '.jpg')
+
+            # Resize if too large to prevent memory issues. Done before anything
+            # decodes the pixels so JPEGs can use draft mode and only decode at
+            # the reduced scale.
+            if max_dim and (src.width > max_dim or src.height > max_dim):
+                src.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS)
+
+            img = ImageOps.exif_transpose(src)  # Handle EXIF rotation
+            img = img.convert('RGB')  # Ensure 3 channels
+
+        # Ensure even dimensions for model compatibility
+        w, h = img.size
+        new_w = w if w % 2 == 0 else w - 1
+        new_h = h if h % 2 == 0 else h - 1
+        if new_w != w or new_h != h:
+            img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as f:
+            img.save(f, format="PNG", compress_level=1)
+            return f.name
+    except Exception as img_err:
+        print(f"PIL processing failed, falling back to raw write: {img_err}")
+        return _write_raw_upload(data, os.path.splitext(name)[1])
+
+def discard_tempfile(path):
+    """Best-effort removal of a tempfile written by this plugin."""
+    if not path:
+        return
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+def replace_upload(uploaded_file, path):
+    """Make path the current upload; the previous file is removed unless a generation still reads it."""
+    previous = uploaded_file['path']
+    uploaded_file['path'] = path
+    if previous not in uploaded_file['in_use']:
+        discard_tempfile(previous)
+
+def claim_upload(uploaded_file):
+    """Mark the current upload as in use by a generation and return its path."""
+    path = uploaded_file['path']
+    uploaded_file['in_use'].append(path)
+    return path
+
+def release_upload(uploaded_file, path):
+    """Undo claim_upload; removes the file if it was replaced while in use."""
+    uploaded_file['in_use'].remove(path)
+    if path != uploaded_file['path'] and path not in uploaded_file['in_use']:
+        discard_tempfile(path)
+
+async def extract_upload_to_tempfile(e, max_dim=None):
+    """Read a ui.upload event and store the image in a tempfile; returns the path.
+
+    The image is re-encoded (EXIF-rotated, RGB, even dimensions, at most max_dim
+    per side if given) unless it already meets those constraints.
+    """
+    # Try to get name from various possible locations
+    name = getattr(e, 'name', None)
+
+    content = getattr(e, 'content', None)
+    file_obj = getattr(e, 'file', None)
+
+    if not name and content:
+        name = getattr(content, 'name', None)
+    if not name and file_obj:
+        name = getattr(file_obj, 'name', None)
+
+    if not name:
+        name = "uploaded_image.png"
+
+    # Try to get content from various possible locations
+    data = None
+    if content and hasattr(content, 'read'):
+        data = content.read()
+        if inspect.iscoroutine(data):
+            data = await data
+    elif file_obj:
+        if hasattr(file_obj, 'read'):
+            data = file_obj.read()
+            if inspect.iscoroutine(data):
+                data = await data
+        elif hasattr(file_obj, '_data'):  # SmallFileUpload
+            data = file_obj._data
+
+    if data is None:
+        raise ValueError(f"Could not extract content from event object: {dir(e)}")
+
+    # Decode/encode work runs off the event loop
+    return await asyncio.to_thread(_write_upload_sync, data, name, max_dim)
+
+# task_card styling is identical for every card, so share the strings
+_CARD_STYLE = (
+    'border-radius: 16px; '
+    'background: rgba(255, 255, 255, 0.05); '
+    'border: 1px solid rgba(255, 255, 255, 0.1);'
+)
+_CARD_CLASSES = 'w-full p-4 transition-all duration-200 relative-position'
+_CARD_ENABLED_CLASSES = f'{_CARD_CLASSES} cursor-pointer hover:bg-white/10 hover:border-primary'
+_CARD_DISABLED_CLASSES = f'{_CARD_CLASSES} opacity-50 cursor-not-allowed'
+_CARD_BADGE_CLASSES = 'absolute-top-right text-xs bg-grey-8 px-2 py-1 rounded-bl-lg opacity-80'
+_CARD_ROW_CLASSES = 'items-center no-wrap w-full gap-4'
+_CARD_ICON_BOX_CLASSES = 'items-center justify-center rounded-xl bg-primary/20 p-3'
+_CARD_ICON_BOX_STYLE = 'width: 56px; height: 56px'
 
 def render_header(title: str, on_back=None):
     with ui.row().classes('w-full bg-transparent text-white p-4 items-center no-wrap gap-4') \
@@ -12,42 +175,29 @@ def normalize_image_result(result):
     if not isinstance(result, dict):
         return False, {}
     data = result.get('data', result)
-    while isinstance(data, dict) and 'data' in data and 'code' in data and not data.get('images') and 'image_path' not in data and data.get('status') != 'success':
-        data = data.get('data')
+    # Unwrap nested {code, data} envelopes until the level that carries the images
+    while isinstance(data, dict) and 'code' in data and 'data' in data:
+        if data.get('images') or 'image_path' in data or data.get('status') == 'success':
+            break
+        data = data['data']
     payload = data if isinstance(data, dict) else {}
-    is_success = False
-    if result.get('code') == 200:
-        is_success = True
-    if payload.get('status') == 'success':
-        is_success = True
-    if payload.get('code') == 200:
-        is_success = True
+    is_success = result.get('code') == 200 or payload.get('status') == 'success' or payload.get('code') == 200
     return is_success, payload
 
 def task_card(title: str, description: str, icon: str, on_click, enabled: bool = True):
     """Render a task card."""
     # Using DawnChat theme colors implicitly via NiceGUI theme setup in main.py
-    
-    card_style = """
-        border-radius: 16px; 
-        background: rgba(255, 255, 255, 0.05);
-        border: 1px solid rgba(255, 255, 255, 0.1);
-    """
-    
-    with ui.card().classes('w-full p-4 transition-all duration-200 relative-position') \
-            .style(card_style) as card:
+    card_classes = _CARD_ENABLED_CLASSES if enabled else _CARD_DISABLED_CLASSES
+    with ui.card().classes(card_classes).style(_CARD_STYLE) as card:
         
         if not enabled:
-            card.classes('opacity-50 cursor-not-allowed')
-            ui.label('Unavailable').classes('absolute-top-right text-xs bg-grey-8 px-2 py-1 rounded-bl-lg opacity-80')
+            ui.label('Unavailable').classes(_CARD_BADGE_CLASSES)
         else:
-            card.classes('cursor-pointer hover:bg-white/10 hover:border-primary')
             card.on('click', on_click)
             
-        with ui.row().classes('items-center no-wrap w-full gap-4'):
+        with ui.row().classes(_CARD_ROW_CLASSES):
             # Icon container
-            with ui.column().classes('items-center justify-center rounded-xl bg-primary/20 p-3') \
-                    .style('width: 56px; height: 56px'):
+            with ui.column().classes(_CARD_ICON_BOX_CLASSES).style(_CARD_ICON_BOX_STYLE):
                 ui.icon(icon, size='24px').classes('text-primary')
                 
             # Content
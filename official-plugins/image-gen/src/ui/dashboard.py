@@ -1,27 +1,48 @@
+import asyncio
+import time
+
 from nicegui import ui
 from dawnchat_sdk import host
 from i18n import i18n
 from .components import render_header, task_card
 
-async def render_dashboard(on_navigate):
-    # Check status
-    try:
-        status = await host.image_gen.get_status()
-    except Exception as e:
-        ui.notify(f"Failed to connect to host: {e}", type='negative')
-        status = {'has_models': False} # Fallback
+# How long the installed model types stay valid across dashboard visits
+CAPS_TTL = 5.0
 
-    # Get models to determine enabled tasks
-    try:
-        models = await host.image_gen.list_models(installed_only=True)
-    except Exception:
-        models = []
+async def _load_model_types():
+    # Check status and get models (to determine enabled tasks) concurrently
+    status, models = await asyncio.gather(
+        host.image_gen.get_status(),
+        host.image_gen.list_models(installed_only=True),
+        return_exceptions=True,
+    )
+    if isinstance(status, Exception):
+        ui.notify(f"Failed to connect to host: {status}", type='negative')
+    if isinstance(models, Exception):
+        return None
         
+    # One pass over the models
+    all_types = set()
+    for m in models:
+        all_types.update(m.get('types', ()))
+    return all_types
+
+async def render_dashboard(on_navigate, state=None):
+    # Reuse recently fetched capabilities so switching pages does not re-hit the host
+    if state is not None and state.caps is not None and time.monotonic() - state.caps_ts < CAPS_TTL:
+        all_types = state.caps
+    else:
+        all_types = await _load_model_types()
+        if state is not None and all_types is not None:
+            state.caps = all_types
+            state.caps_ts = time.monotonic()
+    all_types = all_types or set()
+
     # Check capabilities
-    has_t2i = any('text_to_image' in m.get('types', []) for m in models)
-    has_i2i = any('image_to_image' in m.get('types', []) for m in models)
-    has_inpaint = any('inpaint' in m.get('types', []) for m in models)
-    has_upscale = any('upscale' in m.get('types', []) for m in models)
+    has_t2i = 'text_to_image' in all_types
+    has_i2i = 'image_to_image' in all_types
+    has_inpaint = 'inpaint' in all_types
+    has_upscale = 'upscale' in all_types
 
     render_header(i18n.t('title'))
     
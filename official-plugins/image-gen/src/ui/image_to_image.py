@@ -1,17 +1,13 @@
-import tempfile
 import os
-import inspect
-import io
-from nicegui import ui
+from nicegui import background_tasks, ui
 from dawnchat_sdk import host
 from i18n import i18n
-from .components import render_header, normalize_image_result
-from PIL import Image, ImageOps
+from .components import render_header, normalize_image_result, get_installed_models, extract_upload_to_tempfile, replace_upload, claim_upload, release_upload
 
 async def render_image_to_image(on_back):
     render_header(i18n.t('dashboard.image_to_image'), on_back=on_back)
     
-    uploaded_file = {'path': None}
+    uploaded_file = {'path': None, 'in_use': []}
     
     # Model State
     models = []
@@ -21,7 +17,7 @@ async def render_image_to_image(on_back):
     async def load_models():
         try:
             # Task type 'image_to_image'
-            result = await host.image_gen.list_models(task_type='image_to_image', installed_only=True)
+            result = await get_installed_models('image_to_image')
             models.clear()
             model_map.clear()
             options = {}
@@ -39,65 +35,13 @@ async def render_image_to_image(on_back):
             model_select.update()
             
         except Exception as e:
-            ui.notify(f"Failed to load models: {e}", type='negative')
+            # Runs as a background task, so enter the page's slot before notifying
+            with model_select:
+                ui.notify(f"Failed to load models: {e}", type='negative')
 
     async def handle_upload(e):
         try:
-            # Try to get name from various possible locations
-            name = getattr(e, 'name', None)
-            
-            content = getattr(e, 'content', None)
-            file_obj = getattr(e, 'file', None)
-            
-            if not name and content:
-                name = getattr(content, 'name', None)
-            if not name and file_obj:
-                name = getattr(file_obj, 'name', None)
-                
-            if not name:
-                name = "uploaded_image.png"
-
-            # Try to get content from various possible locations
-            data = None
-            if content and hasattr(content, 'read'):
-                data = content.read()
-                if inspect.iscoroutine(data):
-                    data = await data
-            elif file_obj:
-                if hasattr(file_obj, 'read'):
-                    data = file_obj.read()
-                    if inspect.iscoroutine(data):
-                        data = await data
-                elif hasattr(file_obj, '_data'):  # SmallFileUpload
-                    data = file_obj._data
-            
-            if data is None:
-                raise ValueError(f"Could not extract content from event object: {dir(e)}")
-
-            # Re-process image to ensure it is standard and contiguous
-            try:
-                img = Image.open(io.BytesIO(data))
-                img = ImageOps.exif_transpose(img)  # Handle EXIF rotation
-                img = img.convert('RGB')  # Ensure 3 channels
-                
-                # Ensure even dimensions for model compatibility
-                w, h = img.size
-                new_w = w if w % 2 == 0 else w - 1
-                new_h = h if h % 2 == 0 else h - 1
-                if new_w != w or new_h != h:
-                    img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
-                
-                suffix = ".png"
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as f:
-                    img.save(f, format="PNG")
-                    uploaded_file['path'] = f.name
-            except Exception as img_err:
-                print(f"PIL processing failed, falling back to raw write: {img_err}")
-                suffix = os.path.splitext(name)[1]
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as f:
-                    f.write(data)
-                    uploaded_file['path'] = f.name
-
+            replace_upload(uploaded_file, await extract_upload_to_tempfile(e))
             ui.notify(i18n.t('common.success'))
         except Exception as err:
             ui.notify(f"Upload failed: {err}", type='negative')
@@ -131,6 +75,7 @@ async def render_image_to_image(on_back):
             progress_bar.value = p
             status_label.text = f"{msg} ({int(p*100)}%)"
             
+        image_path = claim_upload(uploaded_file)
         try:
             # Determine workflow_id - must find an i2i workflow, not just take the first one
             workflow_id = "sdxl_i2i_basic"
@@ -145,7 +90,7 @@ async def render_image_to_image(on_back):
                     # If no i2i workflow found, keep default (don't use t2i workflow!)
 
             result = await host.image_gen.image_to_image(
-                image_path=uploaded_file['path'],
+                image_path=image_path,
                 prompt=prompt.value,
                 negative_prompt=negative_prompt.value,
                 strength=float(strength.value),
@@ -186,11 +131,15 @@ async def render_image_to_image(on_back):
             ui.notify(f"{i18n.t('common.error')}: {str(e)}", type='negative')
             with result_container:
                 ui.label(f"Error: {str(e)}").classes('text-red-500')
+        finally:
+            release_upload(uploaded_file, image_path)
 
     ui.button(i18n.t('common.generate'), on_click=generate).classes('w-full mt-4 dc-btn-primary')
     
     # Place result container
     result_container = ui.column().classes('w-full items-center mt-4')
 
-    # Load models
-    await load_models()
+    # Load models in the background so the page paints without waiting on the host
+    model_select.options = {'': i18n.t('common.loading')}
+    model_select.update()
+    background_tasks.create(load_models(), name='load_models')
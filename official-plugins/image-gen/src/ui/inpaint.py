@@ -1,12 +1,55 @@
+import asyncio
 import tempfile
+import time
 import os
-import inspect
-import io
-from nicegui import ui, events
+from nicegui import background_tasks, events, ui
 from dawnchat_sdk import host
 from i18n import i18n
-from .components import render_header, normalize_image_result
-from PIL import Image, ImageDraw, ImageOps
+from .components import render_header, normalize_image_result, get_installed_models, extract_upload_to_tempfile, discard_tempfile, replace_upload, claim_upload, release_upload
+from PIL import Image, ImageDraw
+
+# Minimum seconds between overlay pushes while the mouse moves (~30 Hz)
+SVG_MIN_INTERVAL = 1 / 30
+
+def _path_svg(path, r):
+    """Overlay markup for one stroke: a polyline, or a dot for a single click."""
+    if len(path) > 1:
+        (x0, y0), rest = path[0], path[1:]
+        d = ' '.join([f"M {x0} {y0}"] + [f"L {x} {y}" for x, y in rest])
+        return f'<path d="{d}" />'
+    if path:
+        x, y = path[0]
+        return f'<circle cx="{x}" cy="{y}" r="{r}" fill="white" stroke="none" />'
+    return ''
+
+def _build_mask_sync(image_path, paths, brush_size):
+    """Rasterize the brush strokes into a mask PNG the size of image_path; returns its path."""
+    # Only the size is needed; the header read does not decode the pixels
+    with Image.open(image_path) as original_img:
+        mask_size = original_img.size
+    # Mask needs to be same size as original
+    # Create L mask first
+    l_mask = Image.new('L', mask_size, 0) # Black background
+    draw = ImageDraw.Draw(l_mask)
+    r = brush_size / 2
+
+    for path in paths:
+        if len(path) > 1:
+            draw.line(path, fill=255, width=brush_size, joint='curve')
+        elif len(path) == 1:
+            x, y = path[0]
+            draw.ellipse((x-r, y-r, x+r, y+r), fill=255)
+
+    # Create RGBA image with mask in alpha channel
+    # Ensure brush is white (255,255,255) and opaque (255)
+    # Ensure background is black (0,0,0) and transparent (0) - though transparency is key
+    # The L mask is strictly 0/255, so using it for every band yields exactly that
+    # without allocating a separate white fill layer and pasting through the mask.
+    mask_img = Image.merge('RGBA', (l_mask, l_mask, l_mask, l_mask))
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as f:
+        mask_img.save(f, format='PNG', compress_level=1, optimize=False)
+        return f.name
 
 async def render_inpaint(on_back):
     render_header(i18n.t('dashboard.inpaint'), on_back=on_back)
@@ -32,11 +75,13 @@ async def render_inpaint(on_back):
     ''')
     
     # State
-    uploaded_file = {'path': None}
+    uploaded_file = {'path': None, 'in_use': []}
     paths = [] # List of paths, each path is a list of (x, y) tuples
     
     drawing = False
     mouse_pos = (0, 0)
+    last_svg_ts = 0.0
+    svg_cache = {'brush': None, 'parts': []}  # overlay markup of finished strokes
     
     # Model State
     models = []
@@ -46,7 +91,7 @@ async def render_inpaint(on_back):
     async def load_models():
         try:
             # Task type 'inpaint'
-            result = await host.image_gen.list_models(task_type='inpaint', installed_only=True)
+            result = await get_installed_models('inpaint')
             models.clear()
             model_map.clear()
             options = {}
@@ -65,7 +110,9 @@ async def render_inpaint(on_back):
             model_select.update()
             
         except Exception as e:
-            ui.notify(f"Failed to load models: {e}", type='negative')
+            # Runs as a background task, so enter the page's slot before notifying
+            with model_select:
+                ui.notify(f"Failed to load models: {e}", type='negative')
 
     # UI References
     interactive_image = None
@@ -78,59 +125,12 @@ async def render_inpaint(on_back):
     
     async def handle_upload(e):
         try:
-            # Try to get name
-            name = getattr(e, 'name', None) or "uploaded_image.png"
-            
-            # Get content
-            content = getattr(e, 'content', None)
-            file_obj = getattr(e, 'file', None)
-            
-            data = None
-            if content and hasattr(content, 'read'):
-                data = content.read()
-                if inspect.iscoroutine(data):
-                    data = await data
-            elif file_obj:
-                if hasattr(file_obj, 'read'):
-                    data = file_obj.read()
-                    if inspect.iscoroutine(data):
-                        data = await data
-                elif hasattr(file_obj, '_data'):
-                    data = file_obj._data
-            
-            if data is None:
-                raise ValueError("Could not extract file content")
-
-            # Process image
-            try:
-                img = Image.open(io.BytesIO(data))
-                img = ImageOps.exif_transpose(img)
-                img = img.convert('RGB')
-                
-                # Resize if too large (limit to 2048x2048 to prevent memory issues)
-                max_dim = 2048
-                if img.width > max_dim or img.height > max_dim:
-                    img.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS)
+            # Limit to 2048x2048 to prevent memory issues
+            replace_upload(uploaded_file, await extract_upload_to_tempfile(e, max_dim=2048))
 
-                # Ensure even dimensions
-                w, h = img.size
-                new_w = w if w % 2 == 0 else w - 1
-                new_h = h if h % 2 == 0 else h - 1
-                if new_w != w or new_h != h:
-                    img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
-                
-                suffix = ".png"
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as f:
-                    img.save(f, format="PNG")
-                    uploaded_file['path'] = f.name
-            except Exception as img_err:
-                print(f"Image processing error: {img_err}")
-                with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(name)[1]) as f:
-                    f.write(data)
-                    uploaded_file['path'] = f.name
-            
             # Reset state
             paths.clear()
+            svg_cache['parts'].clear()
             if interactive_image:
                 interactive_image.content = ''
                 interactive_image.source = uploaded_file['path']
@@ -165,10 +165,12 @@ async def render_inpaint(on_back):
                 def undo():
                     if paths:
                         paths.pop()
+                        svg_cache['parts'].clear()
                         update_svg()
                 
                 def clear_mask():
                     paths.clear()
+                    svg_cache['parts'].clear()
                     update_svg()
                 
                 ui.button('Undo', on_click=undo, icon='undo').props('outline size=sm').classes('flex-1')
@@ -210,37 +212,14 @@ async def render_inpaint(on_back):
                         progress_bar = ui.linear_progress(value=0).classes('w-full mb-2')
                         status_label = ui.label(i18n.t('common.processing')).classes('dc-text-secondary')
                 
+                mask_path = None
+                image_path = claim_upload(uploaded_file)
                 try:
-                    # 1. Generate Mask Image
-                    original_img = Image.open(uploaded_file['path'])
-                    # Mask needs to be same size as original
-                    # Create L mask first
-                    l_mask = Image.new('L', original_img.size, 0) # Black background
-                    draw = ImageDraw.Draw(l_mask)
-                    
-                    for path in paths:
-                        if len(path) > 1:
-                            draw.line(path, fill=255, width=int(brush_size.value), joint='curve')
-                        elif len(path) == 1:
-                            x, y = path[0]
-                            r = int(brush_size.value) / 2
-                            draw.ellipse((x-r, y-r, x+r, y+r), fill=255)
-                    
-                    # Create RGBA image with mask in alpha channel
-                    # Ensure brush is white (255,255,255) and opaque (255)
-                    # Ensure background is black (0,0,0) and transparent (0) - though transparency is key
-                    mask_img = Image.new('RGBA', original_img.size, (0, 0, 0, 0))
-                    
-                    # Create a white fill layer
-                    white_fill = Image.new('RGBA', original_img.size, (255, 255, 255, 255))
-                    
-                    # Paste white fill using l_mask as mask
-                    mask_img.paste(white_fill, mask=l_mask)
-                            
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as f:
-                        mask_img.save(f, format='PNG')
-                        mask_path = f.name
-                        
+                    # 1. Generate Mask Image (off the event loop; raster + PNG encode can take a while)
+                    mask_path = await asyncio.to_thread(
+                        _build_mask_sync, image_path, [list(path) for path in paths], int(brush_size.value)
+                    )
+
                     # 2. Call Backend
                     def on_progress(p, msg):
                         normalized = float(p or 0.0)
@@ -258,7 +237,7 @@ async def render_inpaint(on_back):
                             workflow_id = m['recommended_workflows'][0]
 
                     result = await host.image_gen.inpaint(
-                        image_path=uploaded_file['path'],
+                        image_path=image_path,
                         mask_path=mask_path,
                         prompt=prompt.value,
                         negative_prompt=negative_prompt.value,
@@ -305,6 +284,10 @@ async def render_inpaint(on_back):
                              ui.label(f"Error: {str(e)}").classes('text-red-500')
                     import traceback
                     traceback.print_exc()
+                finally:
+                    # The mask is rebuilt on every run, so never keep the old one around
+                    discard_tempfile(mask_path)
+                    release_upload(uploaded_file, image_path)
 
             ui.button(i18n.t('common.generate'), on_click=generate).classes('w-full mt-4 dc-btn-primary')
 
@@ -319,32 +302,36 @@ async def render_inpaint(on_back):
                     if not interactive_image: return
                     
                     bs = int(brush_size.value)
+                    r = bs / 2
+                    # Finished strokes only change on undo/clear or a brush resize, so their
+                    # markup is cached and only the stroke being drawn is re-serialized
+                    finished = len(paths) - 1 if drawing else len(paths)
+                    cached = svg_cache['parts']
+                    if svg_cache['brush'] != bs or len(cached) > finished:
+                        cached.clear()
+                        svg_cache['brush'] = bs
+                    for path in paths[len(cached):finished]:
+                        cached.append(_path_svg(path, r))
+
                     # Mask paths
-                    svg = f'<g stroke="white" stroke-width="{bs}" fill="none" stroke-linecap="round" stroke-linejoin="round" opacity="0.7">'
-                    for path in paths:
-                        if len(path) > 1:
-                            d = f"M {path[0][0]} {path[0][1]}"
-                            for p in path[1:]:
-                                d += f" L {p[0]} {p[1]}"
-                            svg += f'<path d="{d}" />'
-                        elif len(path) == 1:
-                            x, y = path[0]
-                            r = bs / 2
-                            svg += f'<circle cx="{x}" cy="{y}" r="{r}" fill="white" stroke="none" />'
-                    svg += '</g>'
-                    
+                    parts = [f'<g stroke="white" stroke-width="{bs}" fill="none" stroke-linecap="round" stroke-linejoin="round" opacity="0.7">']
+                    parts.extend(cached)
+                    if drawing and paths:
+                        parts.append(_path_svg(paths[-1], r))
+                    parts.append('</g>')
+
                     # Brush cursor (only if we have mouse pos)
                     if uploaded_file['path']:
                         mx, my = mouse_pos
-                        r = bs / 2
                         # Draw a cursor that is visible on both dark and light backgrounds
-                        svg += f'<circle cx="{mx}" cy="{my}" r="{r}" fill="none" stroke="black" stroke-width="1" opacity="0.5" />'
-                        svg += f'<circle cx="{mx}" cy="{my}" r="{r}" fill="white" stroke="none" opacity="0.2" />'
-                        
+                        parts.append(f'<circle cx="{mx}" cy="{my}" r="{r}" fill="none" stroke="black" stroke-width="1" opacity="0.5" />')
+                        parts.append(f'<circle cx="{mx}" cy="{my}" r="{r}" fill="white" stroke="none" opacity="0.2" />')
+
+                    svg = ''.join(parts)
                     interactive_image.content = svg
 
                 def on_mouse(e):
-                    nonlocal drawing, mouse_pos
+                    nonlocal drawing, mouse_pos, last_svg_ts
                     if not uploaded_file['path']:
                         return
                     
@@ -357,10 +344,15 @@ async def render_inpaint(on_back):
                     elif e.type == 'mousemove':
                         if drawing:
                             paths[-1].append((e.image_x, e.image_y))
-                        # Always update svg to show cursor
-                        update_svg()
+                        # Always update svg to show cursor, but push at most ~30 frames/s;
+                        # points keep accumulating and mouseup flushes the final state
+                        now = time.monotonic()
+                        if now - last_svg_ts >= SVG_MIN_INTERVAL:
+                            last_svg_ts = now
+                            update_svg()
                     elif e.type == 'mouseup':
                         drawing = False
+                        last_svg_ts = time.monotonic()
                         update_svg()
 
                 interactive_image = ui.interactive_image(
@@ -378,5 +370,7 @@ async def render_inpaint(on_back):
                     ui.icon('image', size='4rem').classes('mb-4 opacity-50')
                     ui.label('Upload an image to start inpainting').classes('text-lg')
 
-    # Load models on start
-    await load_models()
+    # Load models in the background so the page paints without waiting on the host
+    model_select.options = {'': i18n.t('common.loading')}
+    model_select.update()
+    background_tasks.create(load_models(), name='load_models')
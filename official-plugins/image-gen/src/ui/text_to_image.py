@@ -3,7 +3,7 @@ import os
 from nicegui import ui
 from dawnchat_sdk import host
 from i18n import i18n
-from .components import render_header, normalize_image_result
+from .components import render_header, normalize_image_result, get_installed_models
 
 async def render_text_to_image(on_back):
     render_header(i18n.t('dashboard.text_to_image'), on_back=on_back)
@@ -16,7 +16,7 @@ async def render_text_to_image(on_back):
     async def load_models():
         try:
             # Task type 'text_to_image'
-            result = await host.image_gen.list_models(task_type='text_to_image', installed_only=True)
+            result = await get_installed_models('text_to_image')
             models.clear()
             model_map.clear()
             options = {}
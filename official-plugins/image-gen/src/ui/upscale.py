@@ -5,7 +5,7 @@ import io
 from nicegui import ui
 from dawnchat_sdk import host
 from i18n import i18n
-from .components import render_header, normalize_image_result
+from .components import render_header, normalize_image_result, get_installed_models
 from PIL import Image, ImageOps
 
 async def render_upscale(on_back):
@@ -21,7 +21,7 @@ async def render_upscale(on_back):
     async def load_models():
         try:
             # Task type 'upscale'
-            result = await host.image_gen.list_models(task_type='upscale', installed_only=True)
+            result = await get_installed_models('upscale')
             models.clear()
             model_map.clear()
             options = {}
@@ -92,7 +92,7 @@ async def render_upscale(on_back):
                 
                 suffix = ".png"
                 with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as f:
-                    img.save(f, format="PNG")
+                    img.save(f, format="PNG", compress_level=1)
                     uploaded_file['path'] = f.name
             except Exception as img_err:
                 # Fallback to raw write if PIL fails
@@ -14,7 +14,7 @@ from .host import (
 )
 from .cards import Card as AdaptiveCard, TextBlock, Container, Action
 from .logging import setup_plugin_logging
-from .mcp_router import build_mcp_router, report_task_progress
+from .mcp_router import TaskCallbackDispatcher, build_mcp_router, report_task_progress
 from .api_router import create_tool_proxy_router
 from .task_handle import TaskSnapshot, ToolTaskHandle
 from .tool_errors import (
@@ -24,11 +24,13 @@ from .tool_errors import (
     ToolTimeoutError,
     ToolTransportError,
 )
-from .tool_gateway import ToolCallMode, ToolCallOptions, ToolGateway
+from .tool_gateway import CoalescedFetch, ToolCallMode, ToolCallOptions, ToolGateway
 from .plugin_data import PluginDataPaths
 from .model_downloads import DownloadSource, DownloadTask, ModelDownloadFacade
 from .model_artifacts import is_repo_installed, is_single_file_installed
 from .download_task_store import DownloadTaskStore
+from .llm_cache import LLMResponseCache
+from .server_options import uvicorn_loop_options
 
 __version__ = "1.0.0"
 __all__ = [
@@ -49,10 +51,12 @@ __all__ = [
     "setup_plugin_logging",
     "build_mcp_router",
     "report_task_progress",
+    "TaskCallbackDispatcher",
     "create_tool_proxy_router",
     "ToolGateway",
     "ToolCallMode",
     "ToolCallOptions",
+    "CoalescedFetch",
     "ToolTaskHandle",
     "TaskSnapshot",
     "ToolCallError",
@@ -67,6 +71,8 @@ __all__ = [
     "is_repo_installed",
     "is_single_file_installed",
     "DownloadTaskStore",
+    "LLMResponseCache",
+    "uvicorn_loop_options",
 ]
 
 # UI module is optional and imported separately
@@ -27,11 +27,12 @@ class ToolSubmitRequest(BaseModel):
 def create_tool_proxy_router(
     *,
     host_client: Optional[HostClient] = None,
+    gateway: Optional[ToolGateway] = None,
     prefix: str = "/api/sdk",
 ) -> APIRouter:
     """Create reusable FastAPI router for proxying tool calls from Vue plugins."""
-    client = host_client or HostClient()
-    gateway = ToolGateway(client)
+    if gateway is None:
+        gateway = ToolGateway(host_client or HostClient())
     router = APIRouter(prefix=prefix)
 
     @router.post("/tools/call")
@@ -21,6 +21,9 @@ logger = logging.getLogger("dawnchat_sdk")
 
 DEFAULT_TIMEOUT = 120.0
 DEFAULT_ASYNC_TIMEOUT = 3600.0
+# Plugins fan out concurrent host calls (tool listings, AI, storage) over one
+# pooled client; keep enough idle keep-alive connections for those bursts.
+DEFAULT_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=128)
 ProgressCallback = Callable[[float, str], None]
 
 
@@ -67,6 +70,7 @@ class HttpTransport(BaseTransport):
             self._http_client = httpx.AsyncClient(
                 base_url=self._host_url,
                 timeout=httpx.Timeout(self._timeout),
+                limits=DEFAULT_HTTP_LIMITS,
                 headers={
                     "Content-Type": "application/json",
                     "X-Plugin-ID": self._plugin_id,
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class LLMResponseCache:
+    """In-process LRU cache for deterministic ``host.ai.chat`` responses.
+
+    Only calls made with ``temperature <= 0`` get a cache key; sampled
+    completions are expected to differ between calls and are never cached.
+    """
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self._maxsize = max(1, int(maxsize))
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def cache_key(
+        messages: list[dict[str, Any]],
+        *,
+        temperature: float,
+        model: Optional[str] = None,
+        tools: Optional[list[dict[str, Any]]] = None,
+    ) -> Optional[str]:
+        if temperature > 0:
+            return None
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "tools": tools},
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        response = self._entries.get(key)
+        if response is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return response
+
+    def set(self, key: str, response: dict[str, Any]) -> None:
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self._maxsize,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
@@ -1,15 +1,22 @@
 import asyncio
+from collections import OrderedDict, deque
 import contextvars
 from dataclasses import dataclass, field
 from datetime import datetime
 import inspect
 import json
 import logging
-from typing import Any, Awaitable, Callable, Optional
+from typing import Any, Awaitable, Callable, Optional, Union
 import uuid
 
-from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi import APIRouter, Body
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ValidationError
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
 
 ToolHandler = Callable[[dict[str, Any]], Any]
 TaskProgressCallback = Callable[[str, float, str], Any]
@@ -17,6 +24,11 @@ TaskEventCallback = Callable[[dict[str, Any]], Any]
 
 logger = logging.getLogger(__name__)
 
+_TASK_WAIT_DEFAULT_TIMEOUT = 5.0
+_TASK_WAIT_MAX_TIMEOUT = 60.0
+_TASK_STORE_MAX_SIZE = 1024
+_CALLBACK_QUEUE_MAX_SIZE = 1024
+
 _current_task: contextvars.ContextVar[Optional["PluginTask"]] = contextvars.ContextVar(
     "dawnchat_sdk_current_mcp_task",
     default=None,
@@ -29,6 +41,29 @@ _current_event_callback: contextvars.ContextVar[Optional[TaskEventCallback]] = c
     "dawnchat_sdk_current_task_event_callback",
     default=None,
 )
+_current_dispatcher: contextvars.ContextVar[Optional["TaskCallbackDispatcher"]] = contextvars.ContextVar(
+    "dawnchat_sdk_current_task_callback_dispatcher",
+    default=None,
+)
+
+
+def _dumps_text(payload: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(payload, ensure_ascii=False)
+
+
+class _RpcResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                pass
+        return super().render(content)
 
 
 class JsonRpcRequest(BaseModel):
@@ -54,6 +89,65 @@ class PluginTask:
     runner: Optional[asyncio.Task] = None
 
 
+class TaskCallbackDispatcher:
+    """
+    按顺序在后台执行任务回调，慢回调或异常回调不会阻塞任务本身。
+
+    队列满时丢弃新的回调；队列清空后后台协程退出，下次提交时再启动。
+    后台协程绑定提交时所在的事件循环，换了事件循环（例如原循环已关闭）会在新循环上重新启动。
+    回调在任务结束后才可能执行完，需要观察回调结果时先 ``await join()``。
+    """
+
+    def __init__(self, maxsize: int = _CALLBACK_QUEUE_MAX_SIZE) -> None:
+        self._maxsize = maxsize
+        self._pending: deque[tuple[str, str, Callable[..., Any], tuple[Any, ...]]] = deque()
+        self._worker: Optional[asyncio.Task] = None
+        self._worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def submit(self, kind: str, task_id: str, callback: Callable[..., Any], *args: Any) -> None:
+        if len(self._pending) >= self._maxsize:
+            logger.warning("task callback queue full, dropping %s callback for task %s", kind, task_id)
+            return
+        self._pending.append((kind, task_id, callback, args))
+        self._ensure_worker()
+
+    async def join(self) -> None:
+        """等待目前已提交的回调全部执行完毕。"""
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._pending:
+                self._ensure_worker()
+            worker = self._worker
+            if worker is None or worker.done() or self._worker_loop is not loop:
+                return
+            # asyncio.wait so that cancelling join() never cancels the worker itself.
+            await asyncio.wait({worker})
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker_loop is not loop:
+            self._worker_loop = loop
+            self._worker = loop.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while self._pending:
+            kind, task_id, callback, args = self._pending.popleft()
+            try:
+                callback_result = callback(*args)
+                if inspect.isawaitable(callback_result):
+                    await callback_result
+            except Exception:
+                logger.warning("task %s callback failed for task %s", kind, task_id, exc_info=True)
+
+
+def _dispatch_callback(kind: str, task_id: str, callback: Callable[..., Any], *args: Any) -> None:
+    dispatcher = _current_dispatcher.get()
+    if dispatcher is None:
+        logger.warning("no task callback dispatcher in context, dropping %s callback for task %s", kind, task_id)
+        return
+    dispatcher.submit(kind, task_id, callback, *args)
+
+
 def _build_task_event(task: "PluginTask", event: str) -> dict[str, Any]:
     return {
         "event": event,
@@ -72,13 +166,7 @@ async def _emit_task_event(task: "PluginTask", event: str) -> None:
     callback = _current_event_callback.get()
     if callback is None:
         return
-    payload = _build_task_event(task, event)
-    try:
-        callback_result = callback(payload)
-        if inspect.isawaitable(callback_result):
-            await callback_result
-    except Exception:
-        logger.warning("task event callback failed for task %s", task.task_id, exc_info=True)
+    _dispatch_callback("event", task.task_id, callback, _build_task_event(task, event))
 
 
 async def report_task_progress(progress: float, message: str = "") -> bool:
@@ -98,12 +186,7 @@ async def report_task_progress(progress: float, message: str = "") -> bool:
     task.message = message
     callback = _current_progress_callback.get()
     if callback:
-        try:
-            callback_result = callback(task.task_id, normalized, message)
-            if inspect.isawaitable(callback_result):
-                await callback_result
-        except Exception:
-            logger.warning("task progress callback failed for task %s", task.task_id, exc_info=True)
+        _dispatch_callback("progress", task.task_id, callback, task.task_id, normalized, message)
     await _emit_task_event(task, "task_progress")
     return True
 
@@ -115,6 +198,8 @@ def build_mcp_router(
     enable_async_tasks: bool = True,
     on_task_progress: Optional[TaskProgressCallback] = None,
     on_task_event: Optional[TaskEventCallback] = None,
+    max_tasks: int = _TASK_STORE_MAX_SIZE,
+    callback_dispatcher: Optional[TaskCallbackDispatcher] = None,
 ) -> APIRouter:
     """
     构建通用 MCP JSON-RPC Router。
@@ -124,11 +209,31 @@ def build_mcp_router(
     - tools/list
     - tools/call
     - tools/submit (可选异步)
-    - tasks/get (可选异步)
+    - tasks/get (可选异步，传入 wait_ms 时最多等待该毫秒数再返回状态)
+    - tasks/wait (可选异步，等待任务结束或超时后返回状态)
     - tasks/cancel (可选异步)
+
+    请求体可以是 JSON-RPC 2.0 批量数组，数组中的请求并发处理，响应按请求顺序返回。
+    批量中不带 id 的通知只执行不返回响应（全部为通知时返回 204）；格式错误的条目单独返回 -32600，
+    执行出错的条目单独返回 -32603，不影响其他条目。
+
+    任务表最多保留 ``max_tasks`` 条记录，超出时按提交顺序淘汰已结束的任务；
+    仍在运行的任务不会被淘汰。
+
+    ``on_task_progress`` / ``on_task_event`` 通过 ``callback_dispatcher`` 在后台按序执行；
+    未传入时每个 router 使用自己的调度器。调用方可传入调度器并 ``await join()`` 等待回调执行完。
     """
     tool_defs = [tool for tool in manifest_tools if isinstance(tool, dict) and tool.get("name") in tool_handlers]
-    task_store: dict[str, PluginTask] = {}
+    tools_list_result: dict[str, Any] = {"tools": tool_defs}
+    if enable_async_tasks:
+        tools_list_result["capabilities"] = {
+            "async": True,
+            "task_methods": ["tools/submit", "tasks/get", "tasks/wait", "tasks/cancel"],
+        }
+    task_store: OrderedDict[str, PluginTask] = OrderedDict()
+    if callback_dispatcher is None:
+        callback_dispatcher = TaskCallbackDispatcher()
+    max_tasks = max(1, int(max_tasks))
     router = APIRouter(prefix="/mcp")
 
     def _rpc_error(code: int, message: str, request_id: Any) -> dict:
@@ -147,11 +252,36 @@ def build_mcp_router(
             "content": [
                 {
                     "type": "text",
-                    "text": json.dumps(payload, ensure_ascii=False),
+                    "text": _dumps_text(payload),
                 }
             ]
         }
 
+    def _store_task(task: PluginTask) -> None:
+        task_store[task.task_id] = task
+        if len(task_store) <= max_tasks:
+            return
+        for task_id, stored in list(task_store.items()):
+            if len(task_store) <= max_tasks:
+                break
+            if stored.runner is None:
+                del task_store[task_id]
+
+    def _release_runner(task: PluginTask) -> None:
+        # Drop the finished asyncio.Task (and its coroutine frame) once the outcome
+        # has been copied onto the PluginTask; a None runner marks it evictable.
+        task.runner = None
+
+    def _task_status_result(task: PluginTask) -> dict[str, Any]:
+        return {
+            "task_id": task.task_id,
+            "status": task.status,
+            "progress": task.progress,
+            "message": task.message,
+            "result": task.result,
+            "error": task.error,
+        }
+
     async def _invoke_handler(handler: ToolHandler, arguments: dict[str, Any]) -> Any:
         data = handler(arguments)
         if inspect.isawaitable(data):
@@ -162,6 +292,7 @@ def build_mcp_router(
         task_token = _current_task.set(task)
         callback_token = _current_progress_callback.set(on_task_progress)
         event_callback_token = _current_event_callback.set(on_task_event)
+        dispatcher_token = _current_dispatcher.set(callback_dispatcher)
         task.status = "running"
         task.started_at = datetime.now()
         await _emit_task_event(task, "task_started")
@@ -189,104 +320,139 @@ def build_mcp_router(
             _current_task.reset(task_token)
             _current_progress_callback.reset(callback_token)
             _current_event_callback.reset(event_callback_token)
+            _current_dispatcher.reset(dispatcher_token)
 
-    @router.post("")
-    async def mcp_rpc(payload: JsonRpcRequest):
-        method = payload.method
-        request_id = payload.id
-        if payload.jsonrpc != "2.0":
-            return _rpc_error(-32600, "Invalid JSON-RPC version", request_id)
-
-        if method == "ping":
-            return {"jsonrpc": "2.0", "id": request_id, "result": {"status": "ok"}}
+    async def _rpc_ping(params: dict[str, Any]) -> dict[str, Any]:
+        return {"status": "ok"}
 
-        if method == "tools/list":
-            result: dict[str, Any] = {"tools": tool_defs}
-            if enable_async_tasks:
-                result["capabilities"] = {
-                    "async": True,
-                    "task_methods": ["tools/submit", "tasks/get", "tasks/cancel"],
-                }
-            return {"jsonrpc": "2.0", "id": request_id, "result": result}
-
-        if method == "tools/call":
-            params = payload.params or {}
-            name = params.get("name")
-            arguments = params.get("arguments") or {}
-            handler = tool_handlers.get(str(name))
-            if not handler:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": json.dumps(
-                                    {"code": 404, "message": f"Tool {name} not found", "data": None}, ensure_ascii=False
-                                ),
-                            }
-                        ]
-                    },
-                }
-            data = await _invoke_handler(handler, arguments)
-            return {"jsonrpc": "2.0", "id": request_id, "result": _wrap_tool_result(data)}
-
-        if enable_async_tasks and method == "tools/submit":
-            params = payload.params or {}
-            name = params.get("name")
-            arguments = params.get("arguments") or {}
-            handler = tool_handlers.get(str(name))
-            if not handler:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {"task_id": None, "status": "failed", "error": f"Tool {name} not found"},
-                }
+    async def _rpc_tools_list(params: dict[str, Any]) -> dict[str, Any]:
+        return tools_list_result
 
-            task_id = str(uuid.uuid4())[:8]
-            task = PluginTask(task_id=task_id, tool_name=str(name), arguments=arguments)
-            task.runner = asyncio.create_task(_run_task(task, handler))
-            task_store[task_id] = task
-            return {"jsonrpc": "2.0", "id": request_id, "result": {"task_id": task_id, "status": "accepted"}}
-
-        if enable_async_tasks and method == "tasks/get":
-            params = payload.params or {}
-            task_id = str(params.get("task_id", ""))
-            task = task_store.get(task_id)
-            if not task:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {"task_id": task_id, "status": "not_found", "error": "Task not found"},
-                }
+    async def _rpc_tools_call(params: dict[str, Any]) -> dict[str, Any]:
+        name = params.get("name")
+        arguments = params.get("arguments") or {}
+        handler = tool_handlers.get(str(name))
+        if not handler:
             return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "task_id": task.task_id,
-                    "status": task.status,
-                    "progress": task.progress,
-                    "message": task.message,
-                    "result": task.result,
-                    "error": task.error,
-                },
+                "content": [
+                    {
+                        "type": "text",
+                        "text": _dumps_text({"code": 404, "message": f"Tool {name} not found", "data": None}),
+                    }
+                ]
             }
-
-        if enable_async_tasks and method == "tasks/cancel":
-            params = payload.params or {}
-            task_id = str(params.get("task_id", ""))
-            task = task_store.get(task_id)
-            if not task:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {"task_id": task_id, "cancelled": False, "reason": "Task not found"},
-                }
-            if task.runner and not task.runner.done():
-                task.runner.cancel()
-            return {"jsonrpc": "2.0", "id": request_id, "result": {"task_id": task_id, "cancelled": True}}
-
-        return _rpc_error(-32601, f"Method {method} not found", request_id)
+        data = await _invoke_handler(handler, arguments)
+        return _wrap_tool_result(data)
+
+    async def _rpc_tools_submit(params: dict[str, Any]) -> dict[str, Any]:
+        name = params.get("name")
+        arguments = params.get("arguments") or {}
+        handler = tool_handlers.get(str(name))
+        if not handler:
+            return {"task_id": None, "status": "failed", "error": f"Tool {name} not found"}
+
+        task_id = str(uuid.uuid4())[:8]
+        task = PluginTask(task_id=task_id, tool_name=str(name), arguments=arguments)
+        task.runner = asyncio.create_task(_run_task(task, handler))
+        task.runner.add_done_callback(lambda _runner, task=task: _release_runner(task))
+        _store_task(task)
+        return {"task_id": task_id, "status": "accepted"}
+
+    async def _wait_for_task(task: PluginTask, timeout: float) -> None:
+        runner = task.runner
+        if runner and not runner.done() and timeout > 0:
+            # The runner task finishes exactly when the tool task settles; waiting on it
+            # returns as soon as the handler is done, and never cancels it on timeout.
+            await asyncio.wait({runner}, timeout=min(timeout, _TASK_WAIT_MAX_TIMEOUT))
+
+    async def _rpc_tasks_get(params: dict[str, Any]) -> dict[str, Any]:
+        task_id = str(params.get("task_id", ""))
+        task = task_store.get(task_id)
+        if not task:
+            return {"task_id": task_id, "status": "not_found", "error": "Task not found"}
+        try:
+            wait_ms = float(params.get("wait_ms") or 0)
+        except (TypeError, ValueError):
+            wait_ms = 0.0
+        await _wait_for_task(task, wait_ms / 1000)
+        return _task_status_result(task)
+
+    async def _rpc_tasks_wait(params: dict[str, Any]) -> dict[str, Any]:
+        task_id = str(params.get("task_id", ""))
+        task = task_store.get(task_id)
+        if not task:
+            return {"task_id": task_id, "status": "not_found", "error": "Task not found"}
+        try:
+            timeout = float(params.get("timeout", _TASK_WAIT_DEFAULT_TIMEOUT))
+        except (TypeError, ValueError):
+            timeout = _TASK_WAIT_DEFAULT_TIMEOUT
+        await _wait_for_task(task, timeout)
+        return _task_status_result(task)
+
+    async def _rpc_tasks_cancel(params: dict[str, Any]) -> dict[str, Any]:
+        task_id = str(params.get("task_id", ""))
+        task = task_store.get(task_id)
+        if not task:
+            return {"task_id": task_id, "cancelled": False, "reason": "Task not found"}
+        if task.runner and not task.runner.done():
+            task.runner.cancel()
+        return {"task_id": task_id, "cancelled": True}
+
+    # Method table built once per router; each request is a single lookup.
+    rpc_methods: dict[str, Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]] = {
+        "ping": _rpc_ping,
+        "tools/list": _rpc_tools_list,
+        "tools/call": _rpc_tools_call,
+    }
+    if enable_async_tasks:
+        rpc_methods.update(
+            {
+                "tools/submit": _rpc_tools_submit,
+                "tasks/get": _rpc_tasks_get,
+                "tasks/wait": _rpc_tasks_wait,
+                "tasks/cancel": _rpc_tasks_cancel,
+            }
+        )
+
+    @router.post("", response_class=_RpcResponse)
+    async def mcp_rpc(payload: Union[dict[str, Any], list[Any]] = Body(...)):
+        # Return the response directly so FastAPI skips jsonable_encoder on the envelope.
+        if not isinstance(payload, list):
+            return _RpcResponse(await _handle_raw_rpc(payload))
+        if not payload:
+            return _RpcResponse(_rpc_error(-32600, "Invalid Request", None))
+        # JSON-RPC 2.0 batch: entries run concurrently, responses keep request order.
+        responses = await asyncio.gather(*(_handle_raw_rpc(item, in_batch=True) for item in payload))
+        results = [response for response in responses if response is not None]
+        if not results:
+            return Response(status_code=204)
+        return _RpcResponse(results)
+
+    async def _handle_raw_rpc(item: Any, *, in_batch: bool = False) -> Optional[dict[str, Any]]:
+        # Validate each entry on its own so one malformed batch entry does not reject the rest.
+        try:
+            request = JsonRpcRequest.model_validate(item)
+        except ValidationError:
+            request_id = item.get("id") if isinstance(item, dict) else None
+            return _rpc_error(-32600, "Invalid Request", request_id)
+        try:
+            response = await _handle_rpc(request)
+        except Exception:
+            # One failing entry must not take down the other responses of a batch.
+            logger.exception("MCP method %s failed", request.method)
+            response = _rpc_error(-32603, "Internal error", request.id)
+        # Batch entries without an "id" are notifications: they run but get no response.
+        if in_batch and "id" not in request.model_fields_set and request.jsonrpc == "2.0":
+            return None
+        return response
+
+    async def _handle_rpc(payload: JsonRpcRequest) -> dict[str, Any]:
+        request_id = payload.id
+        if payload.jsonrpc != "2.0":
+            return _rpc_error(-32600, "Invalid JSON-RPC version", request_id)
+        method_handler = rpc_methods.get(payload.method)
+        if method_handler is None:
+            return _rpc_error(-32601, f"Method {payload.method} not found", request_id)
+        return {"jsonrpc": "2.0", "id": request_id, "result": await method_handler(payload.params or {})}
 
     return router
@@ -0,0 +1,13 @@
+import importlib.util
+
+
+def uvicorn_loop_options() -> dict[str, str]:
+    """uvicorn ``loop``/``http`` kwargs preferring uvloop and httptools when installed.
+
+    uvloop is not available on Windows; both fall back to uvicorn's pure-Python
+    implementations when missing.
+    """
+    return {
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") is not None else "asyncio",
+        "http": "httptools" if importlib.util.find_spec("httptools") is not None else "h11",
+    }
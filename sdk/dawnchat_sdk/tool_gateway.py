@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Literal, Optional
+import functools
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Generic, Literal, Optional, TypeVar
 
 from .host_transport import DEFAULT_ASYNC_TIMEOUT, DEFAULT_TIMEOUT, ProgressCallback
 from .result_utils import normalize_tool_result
@@ -12,6 +15,7 @@ if TYPE_CHECKING:
     from .host_client import HostClient
 
 ToolCallMode = Literal["auto", "sync", "async"]
+T = TypeVar("T")
 
 
 @dataclass
@@ -20,11 +24,50 @@ class ToolCallOptions:
     mode: ToolCallMode = "auto"
 
 
+_STATUS_CACHE_PRUNE_THRESHOLD = 256
+
+
+class CoalescedFetch(Generic[T]):
+    """Share one in-flight ``fetch()`` between concurrent callers and reuse its result for ``ttl`` seconds.
+
+    Failed or cancelled fetches are not cached, so the next call tries again.
+    """
+
+    def __init__(self, fetch: Callable[[], Awaitable[T]], *, ttl: float) -> None:
+        self._fetch = fetch
+        self._ttl = ttl
+        self._inflight: Optional[asyncio.Future[T]] = None
+        self._cached: Optional[tuple[float, T]] = None
+
+    async def get(self) -> T:
+        if self._cached is not None and time.monotonic() - self._cached[0] < self._ttl:
+            return self._cached[1]
+        inflight = self._inflight
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch())
+            self._inflight = inflight
+            inflight.add_done_callback(self._on_fetched)
+        return await asyncio.shield(inflight)
+
+    def _on_fetched(self, future: asyncio.Future[T]) -> None:
+        self._inflight = None
+        if not future.cancelled() and future.exception() is None:
+            self._cached = (time.monotonic(), future.result())
+
+
 class ToolGateway:
-    """Unified SDK gateway for sync/async tool calls."""
+    """Unified SDK gateway for sync/async tool calls.
+
+    When ``status_cache_ttl`` is positive, concurrent ``get_task_status`` calls for the
+    same task share one host request, and its result is reused for ``status_cache_ttl``
+    seconds so rapid polling from several clients coalesces.
+    """
 
-    def __init__(self, client: HostClient) -> None:
+    def __init__(self, client: HostClient, *, status_cache_ttl: float = 0.0) -> None:
         self._client = client
+        self._status_cache_ttl = status_cache_ttl
+        self._status_inflight: dict[str, asyncio.Future[dict[str, Any]]] = {}
+        self._status_cache: dict[str, tuple[float, dict[str, Any]]] = {}
 
     async def call_sync(
         self,
@@ -113,12 +156,41 @@ class ToolGateway:
         return await self.call_async(tool_name, arguments=arguments, timeout=timeout)
 
     async def get_task_status(self, task_id: str) -> dict[str, Any]:
+        if self._status_cache_ttl <= 0:
+            return await self._fetch_task_status(task_id)
+
+        cached = self._status_cache.get(task_id)
+        if cached is not None and time.monotonic() - cached[0] < self._status_cache_ttl:
+            return cached[1]
+
+        inflight = self._status_inflight.get(task_id)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_task_status(task_id))
+            self._status_inflight[task_id] = inflight
+            inflight.add_done_callback(functools.partial(self._on_task_status_fetched, task_id))
+        return await asyncio.shield(inflight)
+
+    async def _fetch_task_status(self, task_id: str) -> dict[str, Any]:
         try:
             return await self._client._request("GET", f"/sdk/tasks/{task_id}")
         except Exception as exc:
             raise map_host_error(exc) from exc
 
+    def _on_task_status_fetched(self, task_id: str, future: asyncio.Future[dict[str, Any]]) -> None:
+        self._status_inflight.pop(task_id, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        now = time.monotonic()
+        if len(self._status_cache) >= _STATUS_CACHE_PRUNE_THRESHOLD:
+            self._status_cache = {
+                key: entry
+                for key, entry in self._status_cache.items()
+                if now - entry[0] < self._status_cache_ttl
+            }
+        self._status_cache[task_id] = (now, future.result())
+
     async def cancel_task(self, task_id: str) -> dict[str, Any]:
+        self._status_cache.pop(task_id, None)
         try:
             return await self._client._request("DELETE", f"/sdk/tasks/{task_id}")
         except Exception as exc:
@@ -0,0 +1,23 @@
+from dawnchat_sdk.llm_cache import LLMResponseCache
+
+
+def test_llm_cache_only_keys_deterministic_calls():
+    messages = [{"role": "user", "content": "hi"}]
+    assert LLMResponseCache.cache_key(messages, temperature=0.7) is None
+
+    key = LLMResponseCache.cache_key(messages, temperature=0.0)
+    assert key is not None
+    assert key == LLMResponseCache.cache_key([{"content": "hi", "role": "user"}], temperature=0.0)
+    assert key != LLMResponseCache.cache_key(messages, temperature=0.0, model="other")
+
+
+def test_llm_cache_evicts_least_recently_used():
+    cache = LLMResponseCache(maxsize=2)
+    cache.set("a", {"content": "A"})
+    cache.set("b", {"content": "B"})
+    assert cache.get("a") == {"content": "A"}
+
+    cache.set("c", {"content": "C"})
+    assert cache.get("b") is None
+    assert cache.get("c") == {"content": "C"}
+    assert cache.stats == {"size": 2, "maxsize": 2, "hits": 2, "misses": 1}
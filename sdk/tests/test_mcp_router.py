@@ -0,0 +1,28 @@
+import asyncio
+
+from dawnchat_sdk.mcp_router import TaskCallbackDispatcher
+
+
+def test_callback_dispatcher_restarts_worker_on_new_loop():
+    dispatcher = TaskCallbackDispatcher()
+    seen: list[str] = []
+    never = asyncio.Event()
+
+    async def stuck_callback():
+        await never.wait()
+
+    async def submit_on_first_loop():
+        dispatcher.submit("event", "t1", stuck_callback)
+        await asyncio.sleep(0)
+
+    # The first loop is closed while its worker is still waiting on the stuck callback.
+    first_loop = asyncio.new_event_loop()
+    first_loop.run_until_complete(submit_on_first_loop())
+    first_loop.close()
+
+    async def submit_on_second_loop():
+        dispatcher.submit("event", "t2", seen.append, "second")
+        await asyncio.wait_for(dispatcher.join(), timeout=1.0)
+
+    asyncio.run(submit_on_second_loop())
+    assert seen == ["second"]
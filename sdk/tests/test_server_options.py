@@ -0,0 +1,13 @@
+import importlib.util
+
+from dawnchat_sdk.server_options import uvicorn_loop_options
+
+
+def test_uvicorn_loop_options_prefers_fast_implementations(monkeypatch):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: object())
+    assert uvicorn_loop_options() == {"loop": "uvloop", "http": "httptools"}
+
+
+def test_uvicorn_loop_options_falls_back_when_missing(monkeypatch):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    assert uvicorn_loop_options() == {"loop": "asyncio", "http": "h11"}
@@ -1,7 +1,9 @@
+import asyncio
+
 import pytest
 
 from dawnchat_sdk.task_handle import ToolTaskHandle
-from dawnchat_sdk.tool_gateway import ToolGateway
+from dawnchat_sdk.tool_gateway import CoalescedFetch, ToolGateway
 from dawnchat_sdk.tool_errors import ToolExecutionError
 
 
@@ -123,3 +125,55 @@ async def test_tool_gateway_wait_timeout():
     handle = await gateway.submit("demo.async", arguments={"x": 1})
     with pytest.raises(ToolExecutionError):
         await handle.wait(timeout=0.05, poll_interval=0.01)
+
+
+class _CountingStatusClient(_SlowClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.status_requests = 0
+
+    async def _request(self, method, path, json=None, params=None):
+        if method == "GET":
+            self.status_requests += 1
+            await asyncio.sleep(0.01)
+        return await super()._request(method, path, json=json, params=params)
+
+
+@pytest.mark.asyncio
+async def test_tool_gateway_coalesces_task_status_polls():
+    client = _CountingStatusClient()
+    gateway = ToolGateway(client, status_cache_ttl=60.0)
+
+    results = await asyncio.gather(*(gateway.get_task_status("task-1") for _ in range(5)))
+    assert client.status_requests == 1
+    assert all(result is results[0] for result in results)
+
+    await gateway.get_task_status("task-1")
+    assert client.status_requests == 1
+
+    await gateway.cancel_task("task-1")
+    await gateway.get_task_status("task-1")
+    assert client.status_requests == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesced_fetch_shares_calls_and_retries_failures():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if calls == 1:
+            raise RuntimeError("host unavailable")
+        return ["tool"]
+
+    shared = CoalescedFetch(fetch, ttl=60.0)
+    failures = await asyncio.gather(*(shared.get() for _ in range(3)), return_exceptions=True)
+    assert calls == 1
+    assert all(isinstance(failure, RuntimeError) for failure in failures)
+
+    results = await asyncio.gather(*(shared.get() for _ in range(3)))
+    assert results == [["tool"]] * 3
+    assert await shared.get() == ["tool"]
+    assert calls == 2